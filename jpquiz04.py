@@ -1,262 +1,1073 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
 import random
-import json
 import os
+import time
+import atexit
 from pathlib import Path
 
+from quiz_theme import (BASE_SIZE, Theme, BG, CARD, TEXT, MUTED, FAINT, ON_ACCENT, PRIMARY, 
+                        SUCCESS, DANGER, ACCENT, WARNING, REMAINING, LINK, EXPLANATION_BG)
+
+# filedialog, messagebox, ttk and json are imported where they are first
+# needed so the window comes up without paying for them
+
 class QuizApp:
-    def __init__(self, root):
+    # Callbacks timed by the event-loop watchdog in diagnostics mode
+    WATCHED_CALLBACKS = (
+        "create_start_screen", "load_questions", "search_questions", "create_quiz_screen",
+        "show_answers", "show_results_screen", "next_batch", "draw_batch",
+        "show_final_results", "clear_window", "save_progress", "resume_session",
+        "check_banks", "show_catalog",
+    )
+    # Screens sampled by the leak monitor in leak-check mode
+    SAMPLED_SCREENS = (
+        "create_start_screen", "create_quiz_screen", "show_results_screen", "show_final_results",
+        "show_search_results", "show_stats_screen",
+    )
+    last_session_file = "quiz_last_session.json"
+    session_file = "quiz_session.json"  # Snapshot of the unfinished session
+    WATCH_INTERVAL_MS = 1000  # How often watch mode checks the open banks
+    CATALOG_POLL_MS = 100  # How often the start screen checks on the bank indexer
+    
+    def __init__(self, root, diagnostics=False, bank_paths=None, batch_size=10, seed=None, 
+                 target_difficulty=None, resume=False, watch=False, bank_dir=".", font_size=BASE_SIZE, 
+                 mode=None, leak_check=False, benchmark=False, auto_advance=0):
+        from quiz_modes import DEFAULT_MODE, MODES
+        from quiz_session import SnapshotWriter
+        
         self.root = root
         self.root.title("Japanese Quiz Application")
         self.root.geometry("800x600")
-        self.root.configure(bg="#f0f0f0")
-        
-        self.questions = []
+        self.root.configure(bg=BG)
+        
+        # Shared named fonts; Ctrl +/- resizes every screen in place
+        self.theme = Theme(root, base_size=font_size)
+        self.font_size = self.theme.base_size  # Ctrl-0 goes back to the size asked for
+        self.fonts = self.theme.fonts
+        for sequence, step in (("<Control-plus>", 1), ("<Control-equal>", 1), 
+                               ("<Control-minus>", -1), ("<Control-0>", 0)):
+            self.root.bind(sequence, lambda e, step=step: self.zoom(step))
+        
+        self.questions = []  # Drawn so far, one batch at a time
+        self.session_total = 0  # Questions in the whole session
+        self.composer = None  # Picks the questions of the next batch
+        self.page = None  # "quiz" or "results" while a batch is on screen
+        self.answer_vars = []
         self.original_questions = []  # Keep track of original order
-        self.current_batch_idx = 0
-        self.batch_size = 10
+        self.page_start = 0  # self.questions[page_start:page_end] is the page on screen
+        self.page_end = 0
+        self.default_batch_size = batch_size
+        self.mode = MODES[mode or DEFAULT_MODE]  # Which questions, in what order, how many a page
+        self.batch_size = self.mode.batch_size(batch_size)
+        self.session_pool = None  # Indices a search or review session is limited to
+        self.auto_advance = tk.IntVar(root, value=auto_advance)  # Seconds on a one-question result, 0 = off
+        self.advance_job = None
+        self.default_button = None  # What Enter presses on the screen on show
+        self.page_warning = None  # Inline warning of a one-question page
+        self.benchmark = benchmark  # Timing run: no dialog may wait for an answer
         self.total_score = 0
         self.user_answers = {}
-        self.progress_file = "quiz_progress.json"
-        self.current_file_path = None
+        self.progress_dir = "quiz_progress"  # One shard per bank and a manifest
+        self.progress = None  # ProgressStore, opened on first use
+        self.bank_paths = []
+        self.bank_ranges = {}  # file key -> (start, end) slice of original_questions
+        self.bank_fingerprints = {}  # path -> fingerprint of the loaded version
+        self.bank_dir = bank_dir  # Listed on the start screen from the bank catalog
+        self.catalog_list = None  # Start screen listbox and the paths of its rows
+        self.catalog_paths = []
+        self.catalog_refresh = None  # Future of the bank catalog refresh, started once per run
         self.seen_questions_indices = set()  # Track by original index to prevent any repeats
-        
-        self.create_start_screen()
+        self.rng = random.Random(seed)
+        self.target_difficulty = target_difficulty  # Order questions by IRT difficulty when set
+        self.history = None  # AnswerHistory, opened on first use
+        self.stats = {}  # file key -> StatsAggregator for the open banks
+        self.snapshots = SnapshotWriter(root, self.session_file)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Bound once: a bind_all per screen would leave a Tcl command and the
+        # old canvas behind every time (unbind_all does not delete them)
+        self.canvas = None  # Scrollable canvas of the screen on show, if any
+        self.root.bind_all("<MouseWheel>", self.on_mousewheel)
+        # Drill keys, also bound once: Enter submits or goes on, 1-9 pick a
+        # choice of a one-question page
+        self.root.bind("<Return>", self.on_return)
+        for n in range(1, 10):
+            self.root.bind(f"<Key-{n}>", lambda e, i=n - 1: self.pick_choice(i))
+        
+        self.watchdog = None
+        if diagnostics:
+            self.enable_diagnostics()
+        self.leak_monitor = None
+        if leak_check:
+            self.enable_leak_check()
+        
+        if watch:
+            self.root.after(self.WATCH_INTERVAL_MS, self.check_banks)
+        
+        if bank_paths and resume:
+            # Back to the exact screen the last session was closed on
+            self.resume_session(bank_paths)
+        elif bank_paths:
+            # Go straight to the first question, no start screen or dialog
+            self.start_session(bank_paths, quiet=True)
+        else:
+            self.create_start_screen()
+    
+    def enable_diagnostics(self, log_path="quiz_diagnostics.log"):
+        """Time UI callbacks and record event-loop stalls"""
+        from quiz_watchdog import EventLoopWatchdog
+        
+        self.watchdog = EventLoopWatchdog(self.root)
+        for name in self.WATCHED_CALLBACKS:
+            # Instance attributes shadow the methods, so buttons and lambdas
+            # created afterwards go through the timing wrapper
+            setattr(self, name, self.watchdog.wrap(name, getattr(self, name)))
+        
+        # Hidden key binding dumps the stall buffer on demand
+        self.root.bind_all("<Control-Alt-d>", lambda e: self.watchdog.dump())
+        atexit.register(self.watchdog.dump, log_path)
+        self.watchdog.start()
+    
+    def enable_leak_check(self, log_path="quiz_leaks.log"):
+        """Count widgets, Tcl variables, callbacks and memory after every screen"""
+        from quiz_leaks import LeakMonitor
+        
+        self.leak_monitor = LeakMonitor(self.root)
+        for name in self.SAMPLED_SCREENS:
+            setattr(self, name, self.leak_monitor.wrap(name, getattr(self, name)))
+        atexit.register(self.leak_monitor.dump, log_path)
+        return self.leak_monitor
+    
+    def on_mousewheel(self, event):
+        """Scroll the current screen's canvas"""
+        if self.canvas is not None:
+            self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+    
+    def on_return(self, event):
+        """Press the screen's main button, unless typing in a text box"""
+        if self.default_button is not None and not isinstance(event.widget, (tk.Entry, tk.Spinbox)):
+            self.default_button.invoke()
+    
+    def pick_choice(self, index):
+        """Select a choice of a one-question page from the keyboard"""
+        if self.page == "quiz" and self.page_end - self.page_start == 1:
+            if index < len(self.questions[self.page_start]["choices"]):
+                self.answer_vars[0].set(index)
+    
+    def zoom(self, step):
+        """Make all text a step larger or smaller (0: back to the starting size)"""
+        self.theme.set_base_size(self.theme.base_size + step if step else self.font_size)
     
     def create_start_screen(self):
         """Create the initial screen with file selection"""
+        # Leave the session on disk for the Resume button, and out of the
+        # Mode menu's reach: no session is on screen any more
+        self.snapshots.flush()
+        self.composer = None
+        self.page = None
+        
         self.clear_window()
         
-        frame = tk.Frame(self.root, bg="#f0f0f0")
+        frame = tk.Frame(self.root, bg=BG)
         frame.place(relx=0.5, rely=0.5, anchor="center")
         
         title_label = tk.Label(frame, text="Japanese Quiz Application", 
-                              font=("Arial", 24, "bold"), bg="#f0f0f0", fg="#333")
+                              font=self.fonts["title"], bg=BG, fg=TEXT)
         title_label.pack(pady=20)
         
-        instruction_label = tk.Label(frame, text="Select a question bank file to begin", 
-                                    font=("Arial", 12), bg="#f0f0f0", fg="#666")
+        instruction_label = tk.Label(frame, text="Pick banks from the list or select a question bank file to begin", 
+                                    font=self.fonts["body"], bg=BG, fg=MUTED)
         instruction_label.pack(pady=10)
         
+        mode_frame = tk.Frame(frame, bg=BG)
+        mode_frame.pack(pady=5)
+        tk.Label(mode_frame, text="Mode:", font=self.fonts["body"], bg=BG, fg=MUTED).pack(side="left")
+        self.add_mode_menu(mode_frame, BG, fg=TEXT).pack(side="left", padx=5)
+        
+        # For fast drills in one-at-a-time mode
+        advance_frame = tk.Frame(frame, bg=BG)
+        advance_frame.pack(pady=5)
+        tk.Label(advance_frame, text="Auto-advance after", 
+                 font=self.fonts["small"], bg=BG, fg=MUTED).pack(side="left")
+        tk.Spinbox(advance_frame, from_=0, to=30, width=3, 
+                   textvariable=self.auto_advance, font=self.fonts["small"]).pack(side="left", padx=5)
+        tk.Label(advance_frame, text="seconds (one at a time, 0 = off)", 
+                 font=self.fonts["small"], bg=BG, fg=MUTED).pack(side="left")
+        
+        self.create_catalog_list(frame)
+        
         select_btn = tk.Button(frame, text="Select Question Bank", 
                               command=self.load_questions, 
-                              font=("Arial", 14), bg="#4CAF50", fg="white",
+                              font=self.fonts["large"], bg=SUCCESS, fg=ON_ACCENT,
                               padx=20, pady=10, cursor="hand2")
         select_btn.pack(pady=20)
         
+        last_banks = self.load_last_session()
+        if last_banks:
+            names = ", ".join(self.get_file_key(p) for p in last_banks)
+            resume_btn = tk.Button(frame, text=f"Resume: {names}", 
+                                  command=lambda: self.resume_session(last_banks), 
+                                  font=self.fonts["body"], bg=PRIMARY, fg=ON_ACCENT,
+                                  padx=20, pady=6, cursor="hand2")
+            resume_btn.pack(pady=5)
+            
+            stats_btn = tk.Button(frame, text="Statistics", 
+                                 command=lambda: self.show_stats_screen(last_banks), 
+                                 font=self.fonts["body"], bg=ACCENT, fg=ON_ACCENT,
+                                 padx=20, pady=6, cursor="hand2")
+            stats_btn.pack(pady=5)
+            
+            mistake_count = sum(len(self.answer_history().mistakes(self.get_file_key(p))) 
+                                for p in last_banks)
+            if mistake_count:
+                review_btn = tk.Button(frame, text=f"Review Mistakes ({mistake_count})", 
+                                      command=lambda: self.review_mistakes(last_banks), 
+                                      font=self.fonts["body"], bg=DANGER, fg=ON_ACCENT,
+                                      padx=20, pady=6, cursor="hand2")
+                review_btn.pack(pady=5)
+            
+            # Parse the last banks in the background while the user decides
+            from quiz_bank import warm_cache
+            warm_cache(last_banks)
+        
+        # Search box: 「いかん」, ~あっての, ｲｶﾝ ... across the last session's banks
+        search_frame = tk.Frame(frame, bg=BG)
+        search_frame.pack(pady=10)
+        
+        search_var = tk.StringVar()
+        search_entry = tk.Entry(search_frame, textvariable=search_var, 
+                               font=self.fonts["body"], width=24)
+        search_entry.pack(side="left", padx=5)
+        search_entry.bind("<Return>", lambda e: self.search_questions(search_var.get()))
+        
+        search_btn = tk.Button(search_frame, text="Search Questions", 
+                              command=lambda: self.search_questions(search_var.get()), 
+                              font=self.fonts["small"], bg=WARNING, fg=ON_ACCENT,
+                              padx=10, pady=2, cursor="hand2")
+        search_btn.pack(side="left", padx=5)
+        
         # Show progress info if available
-        if os.path.exists(self.progress_file):
+        if self.progress_store().exists():
             info_label = tk.Label(frame, 
                                 text="(Progress from previous sessions will be loaded)", 
-                                font=("Arial", 10, "italic"), 
-                                bg="#f0f0f0", fg="#999")
+                                font=self.fonts["note"], 
+                                bg=BG, fg=FAINT)
             info_label.pack(pady=5)
     
+    def create_catalog_list(self, frame):
+        """Every bank in bank_dir with its completion, from the catalog and the progress manifest
+
+        The list is drawn from the catalog as last indexed, then redrawn once
+        a background refresh has re-indexed any new or changed banks. The
+        refresh runs once; coming back to the start screen reuses its result.
+        """
+        from quiz_catalog import read_catalog, refresh_in_background
+        
+        catalog_frame = tk.Frame(frame, bg=BG)
+        catalog_frame.pack(pady=5)
+        
+        listbox = tk.Listbox(catalog_frame, selectmode="extended", font=self.fonts["small"], 
+                             width=48, height=6, activestyle="none")
+        scrollbar = tk.Scrollbar(catalog_frame, orient="vertical", command=listbox.yview)
+        listbox.configure(yscrollcommand=scrollbar.set)
+        listbox.pack(side="left")
+        scrollbar.pack(side="right", fill="y")
+        listbox.bind("<Double-Button-1>", lambda e: self.start_selected_banks())
+        listbox.bind("<Return>", lambda e: self.start_selected_banks())
+        self.catalog_list = listbox
+        
+        start_btn = tk.Button(frame, text="Start Selected Banks", 
+                             command=self.start_selected_banks, 
+                             font=self.fonts["body"], bg=SUCCESS, fg=ON_ACCENT,
+                             padx=20, pady=6, cursor="hand2")
+        start_btn.pack(pady=5)
+        
+        if self.catalog_refresh is None:
+            self.catalog_refresh = refresh_in_background(self.bank_dir)
+        future = self.catalog_refresh
+        if future.done() and not future.exception():
+            self.show_catalog(future.result())
+        else:
+            self.show_catalog(read_catalog(self.bank_dir))
+            self.root.after(self.CATALOG_POLL_MS, self.poll_catalog, listbox, future)
+    
+    def poll_catalog(self, listbox, future):
+        """Redraw the bank list once the background refresh is done"""
+        if not future.done():
+            self.root.after(self.CATALOG_POLL_MS, self.poll_catalog, listbox, future)
+        elif listbox is self.catalog_list and listbox.winfo_exists() and not future.exception():
+            self.show_catalog(future.result())
+    
+    def show_catalog(self, rows):
+        """Fill the bank list: name, completion % and answered/playable counts"""
+        progress = self.progress_store().summary()
+        self.catalog_paths = []
+        self.catalog_list.delete(0, "end")
+        for path, row in rows.items():
+            if not row.get('playable'):
+                continue  # Not a question bank, or nothing to play
+            answered = min(progress.get(row['name'], {}).get('answered', 0), row['playable'])
+            percent = answered * 100 // row['playable']
+            self.catalog_list.insert("end", f"{row['name']}   {percent}%   "
+                                            f"({answered}/{row['playable']})")
+            self.catalog_paths.append(path)
+    
+    def start_selected_banks(self):
+        """Start a session over the banks selected in the start screen list"""
+        selected = [self.catalog_paths[i] for i in self.catalog_list.curselection()]
+        if selected:
+            self.start_session(selected)
+    
     def load_questions(self):
         """Open file dialog and load questions"""
+        from tkinter import filedialog
+        
         file_path = filedialog.askopenfilename(
             title="Select Question Bank File", 
-            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+            filetypes=[("Question Banks", "*.txt *.jqb *.jqz"), ("Text Files", "*.txt"), 
+                       ("Binary Banks", "*.jqb *.jqz"), ("All Files", "*.*")]
         )
         
         if file_path:
-            try:
-                self.current_file_path = file_path
-                self.original_questions = self.load_question_bank(file_path)
-                
-                # Load progress for this specific file
-                progress = self.load_progress()
-                file_key = self.get_file_key(file_path)
-                
-                # Get set of already answered question indices
+            self.start_session([file_path])
+    
+    def open_banks(self, bank_paths):
+        """Load banks into original_questions, one index range per bank"""
+        from quiz_bank import BankChain, bank_fingerprint
+        
+        self.bank_paths = []
+        self.bank_ranges = {}
+        self.bank_fingerprints = {}
+        self.original_questions = BankChain()
+        self.seen_questions_indices = set()
+        for file_path in bank_paths:
+            file_key = self.get_file_key(file_path)
+            if file_key in self.bank_ranges:
+                continue  # Same bank given twice
+            self.bank_ranges[file_key] = self.original_questions.append(self.load_question_bank(file_path))
+            self.bank_paths.append(file_path)
+            self.bank_fingerprints[file_path] = bank_fingerprint(file_path)
+        self.stats = self.load_stats(self.bank_ranges)
+    
+    def start_session(self, bank_paths, quiet=False):
+        """Load one or more banks and start a quiz over the questions the mode picks"""
+        from tkinter import messagebox
+        from quiz_bank import bank_issues
+        
+        try:
+            self.open_banks(bank_paths)
+            
+            # Malformed records (e.g. no A: line) stay in the bank so indices
+            # are stable, but are never shown
+            playable = self.original_questions.playable_indices()
+            skipped = len(self.original_questions) - len(playable)
+            
+            answered_indices = self.answered_indices()
+            unanswered_indices = [i for i in playable if i not in answered_indices]
+            
+            if not unanswered_indices and self.mode.answered != "mixed" and self.benchmark:
+                # Time the same first page without asking, and without resetting anything
                 answered_indices = set()
-                if file_key in progress:
-                    answered_indices = set(progress[file_key].get('answered', []))
-                
-                # Filter out already answered questions
-                unanswered_indices = [i for i in range(len(self.original_questions)) 
-                                     if i not in answered_indices]
-                
-                if not unanswered_indices:
-                    # All questions answered - ask to restart
-                    response = messagebox.askyesno(
-                        "All Questions Completed",
-                        f"You've completed all {len(self.original_questions)} questions!\n\n"
-                        "Do you want to restart with all questions?"
-                    )
-                    if response:
+            elif not unanswered_indices and self.mode.answered != "mixed":
+                # All questions answered - ask to restart
+                response = messagebox.askyesno(
+                    "All Questions Completed",
+                    f"You've completed all {len(playable)} questions!\n\n"
+                    "Do you want to restart with all questions?"
+                )
+                if response:
+                    for file_key in self.bank_ranges:
                         self.reset_progress(file_key)
-                        unanswered_indices = list(range(len(self.original_questions)))
-                    else:
-                        return
-                
-                # Randomize the order of unanswered indices
-                random.shuffle(unanswered_indices)
-                
-                # Build question list with original indices attached
-                self.questions = []
-                for idx in unanswered_indices:
-                    q = self.original_questions[idx].copy()
-                    q['original_index'] = idx  # Track original position
-                    self.questions.append(q)
-                
-                # Randomize choices for all questions
-                self.questions = self.randomize_choices(self.questions)
-                
+                    answered_indices = set()
+                else:
+                    return
+            
+            if not self.benchmark:
+                self.save_last_session()
+            
+            if not quiet:
                 # Show info message
+                skipped_note = ""
+                if skipped:
+                    first = ", ".join(f"{self.get_file_key(p)}:{issue.line} {issue.code}" 
+                                      for p in self.bank_paths for issue in bank_issues(p) 
+                                      if issue.code in ("missing-answer", "too-few-choices"))
+                    skipped_note = (f"Skipped malformed questions: {skipped}\n({first[:200]})\n"
+                                    f"Run quiz_validate.py for details.\n\n")
                 messagebox.showinfo(
                     "Questions Loaded",
                     f"Total questions in bank: {len(self.original_questions)}\n"
                     f"Unanswered questions: {len(unanswered_indices)}\n"
                     f"Previously answered: {len(answered_indices)}\n\n"
-                    f"You will only see unanswered questions."
+                    f"{skipped_note}"
+                    f"Mode: {self.mode.label}"
                 )
-                
-                if self.questions:
-                    self.current_batch_idx = 0
-                    self.total_score = 0
-                    self.user_answers = {}
-                    self.seen_questions_indices = set()  # Reset for new session
-                    self.create_quiz_screen()
-                else:
-                    messagebox.showerror("Error", "No questions available!")
+            
+            self.begin_quiz(tiers=self.mode.tiers(playable, answered_indices))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load questions: {str(e)}")
+            if not self.root.winfo_children():
+                self.create_start_screen()
+    
+    def begin_quiz(self, indices=None, tiers=None):
+        """Start a quiz over the given original_questions indices
+
+        indices limit the session to those questions (search results,
+        mistakes to review), in any mode; tiers start a session over the
+        whole banks, as the mode split them. Questions are drawn lazily, one
+        batch at a time, by draw_batch.
+        """
+        from tkinter import messagebox
+        
+        self.session_pool = None if indices is None else list(indices)
+        self.composer = self.make_composer(tiers if indices is None else [self.session_pool])
+        self.session_total = len(self.composer)
+        self.questions = []
+        
+        if self.session_total:
+            self.page_start = self.page_end = 0
+            self.total_score = 0
+            self.user_answers = {}
+            self.seen_questions_indices = set()  # Reset for new session
+            self.create_quiz_screen()
+        else:
+            messagebox.showerror("Error", "No questions available!")
+    
+    def make_composer(self, tiers):
+        """Batch composer drawing lists of original_questions indices, one list after another"""
+        from quiz_batches import BatchComposer, LazySampler, SamplerChain
+        
+        samplers = []
+        for indices in tiers:
+            if self.target_difficulty is not None:
+                # Closest to the target difficulty first, drawn in that order
+                difficulty = self.question_difficulty()
+                indices = sorted(indices, key=lambda i: (abs(difficulty[i] - self.target_difficulty), 
+                                                         self.rng.random()))
+                samplers.append(LazySampler(indices, self.rng, shuffle=False))
+            else:
+                samplers.append(LazySampler(indices, self.rng))
+        # Batches keep grammar points apart so a page does not repeat one
+        return BatchComposer(SamplerChain(samplers), self.grammar_key, self.batch_size)
+    
+    def answered_indices(self):
+        """original_questions indices answered in the open banks, saved or not"""
+        answered = set(self.seen_questions_indices)
+        for file_key, (start, end) in self.bank_ranges.items():
+            progress = self.progress_store().get(file_key)
+            answered.update(start + i for i in progress.get('answered', []))
+        return answered
+    
+    def rebuild_composer(self):
+        """Order the questions not drawn yet by the current mode, keeping the drawn ones"""
+        drawn = {q['original_index'] for q in self.questions}
+        if self.session_pool is not None:
+            tiers = [self.session_pool]
+        else:
+            tiers = self.mode.tiers(self.original_questions.playable_indices(), self.answered_indices())
+        self.composer = self.make_composer([[i for i in tier if i not in drawn] for tier in tiers])
+        self.session_total = len(self.questions) + len(self.composer)
+    
+    def switch_mode(self, name):
+        """Change mode mid-session; the page on screen stays, the next one follows the new mode"""
+        from quiz_modes import MODES
+        
+        self.mode = MODES[name]
+        self.batch_size = self.mode.batch_size(self.default_batch_size)
+        if self.composer is None:
+            return
+        self.rebuild_composer()
+        self.save_snapshot()
+        self.redraw_results()
+    
+    def redraw_results(self):
+        """Draw the results screen on display again: Next page or Finish depends on what is left"""
+        if self.page == "results":
+            batch_score = sum(self.user_answers.get(i) == self.questions[i]["correct"] 
+                              for i in range(self.page_start, self.page_end))
+            self.show_results_screen(self.page_start, self.page_end, batch_score)
+    
+    def add_mode_menu(self, parent, bg, fg=ON_ACCENT):
+        """Drop-down to switch mode; the caller places it"""
+        from quiz_modes import MODES
+        
+        labels = {mode.label: name for name, mode in MODES.items()}
+        mode_var = tk.StringVar(value=self.mode.label)
+        menu = tk.OptionMenu(parent, mode_var, *labels, 
+                             command=lambda label: self.switch_mode(labels[label]))
+        menu.configure(font=self.fonts["small"], bg=bg, fg=fg, 
+                       activebackground=bg, highlightthickness=0)
+        return menu
+    
+    def draw_batch(self):
+        """Append the next batch of questions, with randomized choices, to self.questions"""
+        batch = []
+        for idx in self.composer.next_batch():
+            q = self.original_questions[idx].copy()
+            q['original_index'] = idx  # Track original position
+            batch.append(q)
+        self.questions.extend(self.randomize_choices(batch))
+    
+    def fetch_explanations(self, questions):
+        """Attach explanations to drawn questions, one read per bank"""
+        from quiz_bank import bank_explanations
+        
+        wanted = {}  # file key -> [(question, index within the bank)]
+        for question in questions:
+            if 'explanation' not in question and question['original_index'] is not None:
+                file_key, bank_index = self.locate_question(question['original_index'])
+                wanted.setdefault(file_key, []).append((question, bank_index))
+        for file_path in self.bank_paths:
+            batch = wanted.get(self.get_file_key(file_path))
+            if batch:
+                texts = bank_explanations(file_path, [bank_index for _, bank_index in batch])
+                for (question, _), text in zip(batch, texts):
+                    question['explanation'] = text
+    
+    def check_banks(self):
+        """Watch mode: reload open banks that changed on disk, then check again later"""
+        from quiz_bank import bank_fingerprint
+        
+        changed = []
+        for file_path in self.bank_paths:
+            try:
+                if bank_fingerprint(file_path) != self.bank_fingerprints.get(file_path):
+                    changed.append(file_path)
+            except OSError:
+                pass  # Being replaced right now; look again next time
+        if changed and self.composer is not None:
+            try:
+                self.reload_banks(changed)
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to load questions: {str(e)}")
+                print(f"Error reloading question banks: {e}")
+        self.root.after(self.WATCH_INTERVAL_MS, self.check_banks)
+    
+    def reload_banks(self, changed_paths):
+        """Merge edited banks into the running session
+
+        Questions already drawn, including the batch on screen, stay as they
+        are; questions still to come follow their new positions, edited and
+        new questions join them, and removed ones drop out.
+        """
+        from quiz_bank import BankChain, bank_fingerprint, is_playable, reload_bank
+        
+        # The page on screen keeps the old text; keep its explanations with it
+        self.fetch_explanations(self.questions[self.page_start:])
+        mappings = {}  # file key -> old local index -> new local index or None
+        chain = BankChain()
+        new_ranges = {}
+        for file_path, bank in zip(self.bank_paths, self.original_questions.banks):
+            file_key = self.get_file_key(file_path)
+            result = reload_bank(file_path, bank) if file_path in changed_paths else None
+            if result is not None:
+                bank, mappings[file_key] = result
+            new_ranges[file_key] = chain.append(bank)
+        
+        def remap(idx):
+            file_key, local = self.locate_question(idx)
+            if file_key in mappings:
+                local = mappings[file_key][local]
+            return None if local is None else new_ranges[file_key][0] + local
+        
+        for question in self.questions:
+            if question['original_index'] is not None:
+                question['original_index'] = remap(question['original_index'])
+        self.seen_questions_indices = {i for i in map(remap, self.seen_questions_indices) 
+                                       if i is not None}
+        if self.session_pool is not None:
+            # A limited session keeps its questions, in new indices, plus what the edit added
+            pool = [i for i in map(remap, self.session_pool) if i is not None]
+            for file_key, mapping in mappings.items():
+                start, end = new_ranges[file_key]
+                kept = set(mapping)
+                pool.extend(start + i for i in range(end - start) 
+                            if i not in kept and is_playable(chain[start + i]))
+            self.session_pool = pool
+        
+        self.original_questions = chain
+        self.bank_ranges = new_ranges
+        
+        store = self.progress_store()
+        for file_path in changed_paths:
+            file_key = self.get_file_key(file_path)
+            old_fingerprint = self.bank_fingerprints[file_path]
+            self.bank_fingerprints[file_path] = new_fingerprint = bank_fingerprint(file_path)
+            if file_key not in mappings:
+                continue
+            mapping = mappings[file_key]
+            start, end = new_ranges[file_key]
+            
+            def remap_answered(entry, mapping=mapping, total=end - start, 
+                               old_fingerprint=old_fingerprint, new_fingerprint=new_fingerprint):
+                # Another window watching the same bank may have done this already
+                if entry.get('fingerprint', old_fingerprint) != old_fingerprint:
+                    return
+                entry['answered'] = sorted(mapping[i] for i in entry.get('answered', []) 
+                                           if i < len(mapping) and mapping[i] is not None)
+                entry['total_questions'] = total
+                entry['fingerprint'] = new_fingerprint
+            
+            store.change(file_key, remap_answered)
+            try:
+                # Mistakes to review and answers per question follow the questions too
+                self.answer_history().remap(file_key, mapping, old_fingerprint, new_fingerprint)
+            except OSError as e:
+                print(f"Error remapping answer history: {e}")
+            print(f"Reloaded {file_key}: {mapping.count(None)} of {len(mapping)} questions "
+                  f"edited or removed, {end - start} questions now")
+        try:
+            store.save()
+        except OSError as e:
+            print(f"Error saving progress: {e}")
+        # Everything still to come, against the remapped progress
+        self.rebuild_composer()
+        self.save_snapshot()
+        # The edit may have removed every question still to come
+        self.redraw_results()
+    
+    def resume_session(self, bank_paths):
+        """Restore the session snapshot for these banks, or start a new session"""
+        from quiz_session import load_snapshot
+        
+        snapshot = load_snapshot(self.session_file)
+        if snapshot is None or not self.restore_session(snapshot, bank_paths):
+            self.start_session(bank_paths, quiet=True)
+    
+    def session_snapshot(self):
+        """Everything needed to rebuild the current screen, as JSON-ready data"""
+        from quiz_bank import bank_fingerprint
+        from quiz_session import SNAPSHOT_VERSION, encode_runs
+        
+        return {
+            'version': SNAPSHOT_VERSION,
+            'banks': [[os.path.abspath(p), bank_fingerprint(p)] for p in self.bank_paths],
+            'mode': self.mode.name,
+            'batch_size': self.batch_size,
+            'session_total': self.session_total,
+            'page': self.page,
+            'page_start': self.page_start,
+            'page_end': self.page_end,
+            'score': self.total_score,
+            # Drawn questions as (original index, choice order); the rest is in the bank
+            'drawn': [[q['original_index'], q['order']] for q in self.questions],
+            'answers': [self.user_answers.get(i, -1) for i in range(len(self.questions))],
+            'selections': [var.get() for var in self.answer_vars] if self.page == "quiz" else [],
+            'pool': None if self.session_pool is None else encode_runs(self.session_pool),
+            # One population per tier of the mode, e.g. unanswered then answered
+            'population': [encode_runs(sampler.population) for sampler in self.composer.sampler.samplers],
+            'composer': self.composer.get_state(),
+            # Later pages and their choice orders come out as they would have
+            'rng': self.rng_state(),
+        }
+    
+    def rng_state(self):
+        """The random generator's state as JSON-ready lists"""
+        version, internal, gauss_next = self.rng.getstate()
+        return [version, list(internal), gauss_next]
+    
+    def restore_session(self, snapshot, bank_paths):
+        """Rebuild a session from its snapshot; False if it does not fit the banks"""
+        from quiz_bank import bank_fingerprint
+        from quiz_batches import BatchComposer, LazySampler, SamplerChain
+        from quiz_modes import MODES
+        from quiz_session import decode_runs
+        
+        try:
+            saved = snapshot['banks']
+            if [path for path, _ in saved] != [os.path.abspath(p) for p in bank_paths]:
+                return False
+            # An edited bank may have moved its questions around
+            if any(bank_fingerprint(path) != fingerprint for path, fingerprint in saved):
+                return False
+            
+            self.open_banks(bank_paths)
+            self.mode = MODES[snapshot['mode']]
+            self.batch_size = snapshot['batch_size']
+            pool = snapshot['pool']
+            self.session_pool = None if pool is None else decode_runs(pool)
+            version, internal, gauss_next = snapshot['rng']
+            self.rng.setstate((version, tuple(internal), gauss_next))
+            sampler = SamplerChain([LazySampler(decode_runs(runs), self.rng) for runs in snapshot['population']])
+            self.composer = BatchComposer(sampler, self.grammar_key, self.batch_size)
+            self.composer.set_state(snapshot['composer'])
+            
+            questions = []
+            for idx, order in snapshot['drawn']:
+                q = self.original_questions[idx].copy()
+                q['original_index'] = idx
+                questions.append(self.apply_order(q, order))
+            self.questions = questions
+            self.user_answers = {i: a for i, a in enumerate(snapshot['answers']) if a != -1}
+            self.seen_questions_indices = {questions[i]['original_index'] for i in self.user_answers}
+            self.session_total = snapshot['session_total']
+            self.page_start = snapshot['page_start']
+            self.page_end = snapshot['page_end']
+            self.total_score = snapshot['score']
+            page = snapshot['page']
+            selections = snapshot['selections']
+        except (OSError, KeyError, IndexError, TypeError, ValueError):
+            return False
+        
+        if page == "results":
+            batch_score = sum(self.user_answers.get(i) == self.questions[i]["correct"] 
+                              for i in range(self.page_start, self.page_end))
+            self.show_results_screen(self.page_start, self.page_end, batch_score)
+        else:
+            self.create_quiz_screen(selections)
+        return True
+    
+    def save_snapshot(self, now=False):
+        """Schedule a debounced snapshot write; now=True writes it at once"""
+        if self.composer is None:
+            return
+        self.snapshots.schedule(self.session_snapshot)
+        if now:
+            self.snapshots.flush()
+    
+    def on_close(self):
+        """Write any pending snapshot before the window goes away"""
+        self.snapshots.flush()
+        self.root.destroy()
+    
+    def review_mistakes(self, bank_paths):
+        """Quiz on the questions whose latest answer was wrong, straight from the history index"""
+        from tkinter import messagebox
+        from quiz_bank import is_playable
+        
+        try:
+            self.open_banks(bank_paths)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load questions: {str(e)}")
+            return
+        
+        indices = []
+        for file_key, (start, end) in self.bank_ranges.items():
+            for i in self.answer_history().mistakes(file_key):
+                # The bank may have been edited since the mistake was recorded
+                if start + i < end and is_playable(self.original_questions[start + i]):
+                    indices.append(start + i)
+        self.begin_quiz(indices)
+    
+    def search_questions(self, query):
+        """Search the last session's banks (or a chosen bank) and list the matches"""
+        from tkinter import filedialog, messagebox
+        from quiz_bank import is_playable
+        from quiz_search import get_search_index
+        
+        query = query.strip()
+        if not query:
+            return
+        
+        bank_paths = self.bank_paths or self.load_last_session()
+        if not bank_paths:
+            file_path = filedialog.askopenfilename(
+                title="Select Question Bank to Search", 
+                filetypes=[("Question Banks", "*.txt *.jqb *.jqz"), ("All Files", "*.*")]
+            )
+            if not file_path:
+                return
+            bank_paths = [file_path]
+        
+        try:
+            self.open_banks(bank_paths)
+            matches = []
+            for file_path in self.bank_paths:
+                start, end = self.bank_ranges[self.get_file_key(file_path)]
+                index = get_search_index(file_path, self.load_question_bank(file_path))
+                for idx, fields in index.search(query):
+                    if is_playable(self.original_questions[start + idx]):
+                        matches.append((start + idx, fields))
+        except Exception as e:
+            messagebox.showerror("Error", f"Search failed: {str(e)}")
+            return
+        
+        self.show_search_results(query, matches)
+    
+    def show_search_results(self, query, matches):
+        """List search matches with a button to quiz on them"""
+        from tkinter import ttk
+        
+        self.clear_window()
+        
+        # Header frame
+        header_frame = tk.Frame(self.root, bg=PRIMARY, height=70)
+        header_frame.pack(fill="x")
+        header_frame.pack_propagate(False)
+        
+        title_label = tk.Label(header_frame, 
+                              text=f"「{query}」: {len(matches)} matching questions", 
+                              font=self.fonts["heading"], bg=PRIMARY, fg=ON_ACCENT)
+        title_label.pack(pady=20)
+        
+        # Create scrollable frame
+        canvas_frame = tk.Frame(self.root, bg=BG)
+        canvas_frame.pack(fill="both", expand=True)
+        
+        canvas = tk.Canvas(canvas_frame, bg=BG, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg=BG)
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        canvas.pack(side="left", fill="both", expand=True, padx=20)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Only the first matches are drawn; all of them go into the quiz
+        for idx, fields in matches[:50]:
+            question = self.original_questions[idx]
+            q_frame = tk.Frame(scrollable_frame, bg=CARD, relief="solid", borderwidth=1)
+            q_frame.pack(fill="x", pady=5, padx=10)
+            
+            q_label = tk.Label(q_frame, 
+                              text=question["question"], 
+                              font=self.fonts["body_bold"], 
+                              bg=CARD, 
+                              wraplength=700,
+                              justify="left",
+                              anchor="w")
+            q_label.pack(fill="x", padx=15, pady=(10, 2))
+            
+            where_label = tk.Label(q_frame, 
+                                  text=f"matched in: {', '.join(fields)}", 
+                                  font=self.fonts["note"], 
+                                  bg=CARD, fg=FAINT, anchor="w")
+            where_label.pack(fill="x", padx=15, pady=(0, 8))
+        
+        if len(matches) > 50:
+            more_label = tk.Label(scrollable_frame, 
+                                 text=f"... and {len(matches) - 50} more", 
+                                 font=self.fonts["small"], bg=BG, fg=MUTED)
+            more_label.pack(pady=5)
+        
+        # Navigation buttons
+        button_frame = tk.Frame(self.root, bg=BG, height=70)
+        button_frame.pack(fill="x")
+        button_frame.pack_propagate(False)
+        
+        btn_container = tk.Frame(button_frame, bg=BG)
+        btn_container.pack(expand=True)
+        
+        if matches:
+            quiz_btn = tk.Button(btn_container, 
+                                text=f"Quiz These {len(matches)} Questions", 
+                                command=lambda: self.begin_quiz([idx for idx, fields in matches]),
+                                font=self.fonts["large_bold"],
+                                bg=SUCCESS,
+                                fg=ON_ACCENT,
+                                padx=30,
+                                pady=10,
+                                cursor="hand2")
+            quiz_btn.pack(side="left", padx=10)
+        
+        back_btn = tk.Button(btn_container, 
+                            text="Back", 
+                            command=self.create_start_screen,
+                            font=self.fonts["large"],
+                            bg=DANGER,
+                            fg=ON_ACCENT,
+                            padx=30,
+                            pady=10,
+                            cursor="hand2")
+        back_btn.pack(side="left", padx=10)
+        
+        # The mouse wheel scrolls this canvas until the next screen
+        self.canvas = canvas
     
     def get_file_key(self, file_path):
         """Generate a unique key for the file"""
         return os.path.basename(file_path)
     
-    def load_progress(self):
-        """Load progress from JSON file"""
-        if os.path.exists(self.progress_file):
-            try:
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+    def locate_question(self, idx):
+        """Map an original_questions index to (file key, index within that bank)"""
+        for file_key, (start, end) in self.bank_ranges.items():
+            if start <= idx < end:
+                return file_key, idx - start
+        raise IndexError(f"question index {idx} is not in any open bank")
     
-    def save_progress(self):
-        """Save progress to JSON file"""
-        if not self.current_file_path:
-            return
+    def grammar_key(self, idx):
+        """Grammar point of a question, for batch planning; unique if it has none"""
+        from quiz_bank import grammar_point
+        
+        return grammar_point(self.original_questions[idx]["question"]) or ("question", idx)
+    
+    def question_difficulty(self):
+        """Calibrated difficulty for every open question, 0.0 where uncalibrated"""
+        from quiz_bank import bank_difficulty
+        
+        difficulty = []
+        for file_path in self.bank_paths:
+            start, end = self.bank_ranges[self.get_file_key(file_path)]
+            values = bank_difficulty(file_path) or []
+            values = list(values[:end - start]) + [None] * (end - start - len(values))
+            difficulty.extend(0.0 if v is None else v for v in values)
+        return difficulty
+    
+    def load_stats(self, file_keys):
+        """Running statistics for each bank, as saved with its progress"""
+        from quiz_stats import StatsAggregator
         
-        progress = self.load_progress()
-        file_key = self.get_file_key(self.current_file_path)
+        store = self.progress_store()
+        return {key: StatsAggregator(store.get(key).get('stats')) for key in file_keys}
+    
+    def answer_history(self):
+        """The per-answer history log, opened on first use"""
+        if self.history is None:
+            from quiz_history import AnswerHistory
+            self.history = AnswerHistory()
+        return self.history
+    
+    @classmethod
+    def load_last_session(cls):
+        """Return the bank paths of the previous session that still exist"""
+        import json
         
-        # Merge with existing progress
-        if file_key not in progress:
-            progress[file_key] = {'answered': []}
+        try:
+            with open(cls.last_session_file, 'r', encoding='utf-8') as f:
+                paths = json.load(f).get('banks', [])
+        except (OSError, ValueError, AttributeError):
+            return []
+        return [p for p in paths if os.path.exists(p)]
+    
+    def save_last_session(self):
+        """Remember the current banks for the resume button and --resume"""
+        from quiz_io import atomic_write_json
         
-        existing_answered = set(progress[file_key].get('answered', []))
-        existing_answered.update(self.seen_questions_indices)
-        progress[file_key]['answered'] = sorted(list(existing_answered))
-        progress[file_key]['total_questions'] = len(self.original_questions)
+        try:
+            atomic_write_json(self.last_session_file, 
+                              {'banks': [os.path.abspath(p) for p in self.bank_paths]}, indent=2)
+        except OSError as e:
+            print(f"Error saving last session: {e}")
+    
+    def progress_store(self):
+        """Per-bank progress shards, each parsed once and cached in memory"""
+        if self.progress is None:
+            from quiz_progress import ProgressStore
+            self.progress = ProgressStore(self.progress_dir)
+        return self.progress
+    
+    def save_progress(self):
+        """Save progress for the open banks
+
+        Only the open banks are queued as changed; the store merges them into
+        the latest shards under their locks, so several quiz windows can save
+        without losing each other's answers.
+        """
+        if not self.bank_paths:
+            return
         
+        store = self.progress_store()
+        saved_stats = {}  # file key -> counters as saved, once the save went through
+        for file_path in self.bank_paths:
+            file_key = self.get_file_key(file_path)
+            start, end = self.bank_ranges[file_key]
+            answered = [i - start for i in self.seen_questions_indices if start <= i < end]
+            
+            def update(entry, file_key=file_key, answered=answered, total=end - start, 
+                       fingerprint=self.bank_fingerprints.get(file_path)):
+                entry['answered'] = sorted(set(entry.get('answered', [])).union(answered))
+                entry['total_questions'] = total
+                # The bank version these indices refer to, for reload_banks
+                entry['fingerprint'] = fingerprint
+                if file_key in self.stats:
+                    # Counters saved by other windows, plus this window's new answers
+                    saved_stats[file_key] = self.stats[file_key].rebase(entry.get('stats'))
+                    entry['stats'] = saved_stats[file_key].to_dict()
+            
+            # This window's whole state: it covers a save of it that failed
+            store.change(file_key, update, name="session")
         try:
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress, f, indent=2)
-        except Exception as e:
+            store.save()
+        except OSError as e:
             print(f"Error saving progress: {e}")
+        for file_key, stats in saved_stats.items():
+            # Answers of a bank whose shard was not written stay unsaved for the next try
+            if not store.is_pending(file_key):
+                self.stats[file_key] = stats
     
     def reset_progress(self, file_key):
         """Reset progress for a specific file"""
-        progress = self.load_progress()
-        if file_key in progress:
-            del progress[file_key]
-            try:
-                with open(self.progress_file, 'w', encoding='utf-8') as f:
-                    json.dump(progress, f, indent=2)
-            except:
-                pass
+        def reset(entry):
+            # Statistics survive a restart of the bank
+            entry['answered'] = []
+        
+        store = self.progress_store()
+        store.change(file_key, reset)
+        try:
+            store.save()
+        except OSError as e:
+            print(f"Error resetting progress: {e}")
     
     def load_question_bank(self, file_path):
-        """Load questions from file"""
-        questions = []
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
-        question = None
-        choices = []
-        correct = None
-        explanation = None
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith("Q:"):
-                if question:
-                    questions.append({
-                        "question": question,
-                        "choices": choices,
-                        "correct": correct,
-                        "explanation": explanation
-                    })
-                question = line[2:].strip()
-                choices = []
-                correct = None
-                explanation = None
-            elif line.startswith("A:"):
-                correct = len(choices)
-                choices.append(line[2:].strip())
-            elif line.startswith("B:") or line.startswith("C:"):
-                choices.append(line[2:].strip())
-            elif line.startswith("Explanation:"):
-                explanation = line[12:].strip()
-        
-        if question:
-            questions.append({
-                "question": question,
-                "choices": choices,
-                "correct": correct,
-                "explanation": explanation
-            })
-        
-        return questions
+        """Load questions from file, through the compiled bank cache"""
+        from quiz_bank import load_bank
+        
+        return load_bank(file_path)
     
     def randomize_choices(self, questions):
         """Randomize answer choices"""
         randomized = []
         for question in questions:
-            q_copy = question.copy()
-            q_copy['choices'] = question['choices'].copy()
-            correct_answer = q_copy["choices"][q_copy["correct"]]
-            random.shuffle(q_copy["choices"])
-            q_copy["correct"] = q_copy["choices"].index(correct_answer)
-            randomized.append(q_copy)
+            order = list(range(len(question['choices'])))
+            self.rng.shuffle(order)
+            randomized.append(self.apply_order(question, order))
         return randomized
     
-    def create_quiz_screen(self):
-        """Create the quiz interface with 10 questions"""
+    def apply_order(self, question, order):
+        """Copy of question with its choices shown in the given order"""
+        q_copy = question.copy()
+        # order[j] is the original position (0 = A) of the choice shown at j
+        q_copy['order'] = order
+        q_copy['choices'] = [question['choices'][j] for j in order]
+        q_copy["correct"] = order.index(question["correct"])
+        return q_copy
+    
+    def create_quiz_screen(self, selections=None):
+        """Create the quiz interface with 10 questions
+
+        selections are choices already picked on this page, from a snapshot.
+        """
+        from tkinter import ttk
+        
         self.clear_window()
         
-        start_idx = self.current_batch_idx * self.batch_size
-        end_idx = min(start_idx + self.batch_size, len(self.questions))
+        start_idx = self.page_start
+        if start_idx >= len(self.questions):
+            self.draw_batch()
+            self.page_end = len(self.questions)
+        end_idx = self.page_end
+        if end_idx <= start_idx:
+            # Nothing left to draw, e.g. a reload removed the rest
+            self.show_final_results()
+            return
         current_batch = self.questions[start_idx:end_idx]
-        
-        # Mark these questions as seen (using original indices)
-        for i in range(start_idx, end_idx):
-            if 'original_index' in self.questions[i]:
-                self.seen_questions_indices.add(self.questions[i]['original_index'])
+        self.page = "quiz"
         
         # Header frame
-        header_frame = tk.Frame(self.root, bg="#2196F3", height=70)
+        header_frame = tk.Frame(self.root, bg=PRIMARY, height=70)
         header_frame.pack(fill="x")
         header_frame.pack_propagate(False)
         
         progress_label = tk.Label(header_frame, 
-                                 text=f"Questions {start_idx + 1}-{end_idx} of {len(self.questions)}", 
-                                 font=("Arial", 16, "bold"), bg="#2196F3", fg="white")
+                                 text=f"Questions {start_idx + 1}-{end_idx} of {self.session_total}", 
+                                 font=self.fonts["heading"], bg=PRIMARY, fg=ON_ACCENT)
         progress_label.pack(pady=20)
         
+        # Mode can change mid-session; it applies from the next page
+        self.add_mode_menu(header_frame, PRIMARY).place(relx=1.0, rely=0.5, x=-10, anchor="e")
+        
         # Create scrollable frame
-        canvas_frame = tk.Frame(self.root, bg="#f0f0f0")
+        canvas_frame = tk.Frame(self.root, bg=BG)
         canvas_frame.pack(fill="both", expand=True)
         
-        canvas = tk.Canvas(canvas_frame, bg="#f0f0f0", highlightthickness=0)
+        canvas = tk.Canvas(canvas_frame, bg=BG, highlightthickness=0)
         scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg="#f0f0f0")
+        scrollable_frame = tk.Frame(canvas, bg=BG)
         
         scrollable_frame.bind(
             "<Configure>",
@@ -269,32 +1080,29 @@ class QuizApp:
         canvas.pack(side="left", fill="both", expand=True, padx=20)
         scrollbar.pack(side="right", fill="y")
         
-        # Bind mouse wheel for scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
         # Create questions
         self.answer_vars = []
         for i, question in enumerate(current_batch):
             question_idx = start_idx + i
             
             # Question frame
-            q_frame = tk.Frame(scrollable_frame, bg="white", relief="solid", borderwidth=1)
+            q_frame = tk.Frame(scrollable_frame, bg=CARD, relief="solid", borderwidth=1)
             q_frame.pack(fill="x", pady=10, padx=10)
             
             # Question number and text
             q_label = tk.Label(q_frame, 
                               text=f"Question {question_idx + 1}: {question['question']}", 
-                              font=("Arial", 13, "bold"), 
-                              bg="white", 
+                              font=self.fonts["question"], 
+                              bg=CARD, 
                               wraplength=700,
                               justify="left",
                               anchor="w")
             q_label.pack(fill="x", padx=15, pady=(15, 10))
             
             # Radio buttons for choices
-            answer_var = tk.IntVar(value=-1)
+            selected = selections[i] if selections and i < len(selections) else -1
+            answer_var = tk.IntVar(value=selected)
+            answer_var.trace_add("write", lambda *args: self.save_snapshot())
             self.answer_vars.append(answer_var)
             
             for j, choice in enumerate(question["choices"]):
@@ -302,98 +1110,129 @@ class QuizApp:
                                    text=choice, 
                                    variable=answer_var, 
                                    value=j,
-                                   font=("Arial", 12),
-                                   bg="white",
-                                   activebackground="white",
+                                   font=self.fonts["body"],
+                                   bg=CARD,
+                                   activebackground=CARD,
                                    padx=30,
                                    pady=5,
                                    wraplength=650,
                                    justify="left")
                 rb.pack(anchor="w", padx=15)
             
+            if len(current_batch) == 1:
+                # "Please select an answer" goes here, not in a dialog
+                self.page_warning = tk.Label(q_frame, font=self.fonts["body_bold"], bg=CARD, fg=WARNING)
+                self.page_warning.pack(anchor="w", padx=15)
+            
             # Add some space at the bottom
-            tk.Frame(q_frame, bg="white", height=10).pack()
+            tk.Frame(q_frame, bg=CARD, height=10).pack()
         
         # Submit button frame
-        button_frame = tk.Frame(self.root, bg="#f0f0f0", height=70)
+        button_frame = tk.Frame(self.root, bg=BG, height=70)
         button_frame.pack(fill="x")
         button_frame.pack_propagate(False)
         
         submit_btn = tk.Button(button_frame, 
                               text="Submit Answers", 
                               command=lambda: self.show_answers(start_idx, end_idx),
-                              font=("Arial", 14, "bold"),
-                              bg="#4CAF50",
-                              fg="white",
+                              font=self.fonts["large_bold"],
+                              bg=SUCCESS,
+                              fg=ON_ACCENT,
                               padx=40,
                               pady=10,
                               cursor="hand2")
         submit_btn.pack(pady=15)
+        self.default_button = submit_btn
         
-        # Store canvas reference for cleanup
+        # The mouse wheel scrolls this canvas until the next screen
         self.canvas = canvas
+        self.save_snapshot()
     
     def show_answers(self, start_idx, end_idx):
         """Show all answers and explanations for the current batch"""
+        from tkinter import messagebox
+        
         # Check if all questions are answered
         unanswered = []
         for i, var in enumerate(self.answer_vars):
             if var.get() == -1:
                 unanswered.append(i + 1)
         
+        if unanswered and len(self.answer_vars) == 1:
+            self.page_warning.config(text="Please select an answer!")
+            return
         if unanswered:
             messagebox.showwarning("Incomplete", 
                                   f"Please answer all questions!\nUnanswered: {', '.join(map(str, unanswered))}")
             return
         
+        from quiz_bank import grammar_point
+        
         # Calculate score for this batch
         batch_score = 0
+        history = self.answer_history()
+        now = time.time()
         for i, var in enumerate(self.answer_vars):
             question_idx = start_idx + i
-            if var.get() == self.questions[question_idx]["correct"]:
+            question = self.questions[question_idx]
+            is_correct = var.get() == question["correct"]
+            if is_correct:
                 batch_score += 1
             self.user_answers[question_idx] = var.get()
+            if question['original_index'] is None:
+                continue  # Removed from its bank while on screen
+            # Counts as answered only once submitted
+            self.seen_questions_indices.add(question['original_index'])
+            
+            file_key, bank_index = self.locate_question(question['original_index'])
+            history.record(file_key, bank_index, question['order'][var.get()], is_correct, 
+                           var.get(), question["correct"], timestamp=now)
+            self.stats[file_key].update(grammar_point(question['question']), is_correct, now)
         
         self.total_score += batch_score
         
-        # Save progress after each batch
+        # Save progress and answer history after each batch
         self.save_progress()
+        history.flush()
         
-        # Unbind mousewheel from old canvas
-        if hasattr(self, 'canvas'):
-            self.canvas.unbind_all("<MouseWheel>")
-        
-        # Show results screen
+        # Show results screen; the snapshot must not offer this page for submitting again
         self.show_results_screen(start_idx, end_idx, batch_score)
+        self.save_snapshot(now=True)
     
     def show_results_screen(self, start_idx, end_idx, batch_score):
         """Display results with answers and explanations"""
+        from tkinter import ttk
+        
         self.clear_window()
         
         current_batch = self.questions[start_idx:end_idx]
+        self.page = "results"
+        self.fetch_explanations(current_batch)
         
         # Header frame
-        header_frame = tk.Frame(self.root, bg="#2196F3", height=90)
+        header_frame = tk.Frame(self.root, bg=PRIMARY, height=90)
         header_frame.pack(fill="x")
         header_frame.pack_propagate(False)
         
         title_label = tk.Label(header_frame, 
                               text=f"Results: Questions {start_idx + 1}-{end_idx}", 
-                              font=("Arial", 16, "bold"), bg="#2196F3", fg="white")
+                              font=self.fonts["heading"], bg=PRIMARY, fg=ON_ACCENT)
         title_label.pack(pady=10)
         
+        self.add_mode_menu(header_frame, PRIMARY).place(relx=1.0, y=10, x=-10, anchor="ne")
+        
         score_label = tk.Label(header_frame, 
                               text=f"Score: {batch_score}/{len(current_batch)} ({batch_score/len(current_batch)*100:.1f}%)", 
-                              font=("Arial", 14), bg="#2196F3", fg="white")
+                              font=self.fonts["large"], bg=PRIMARY, fg=ON_ACCENT)
         score_label.pack()
         
         # Create scrollable frame
-        canvas_frame = tk.Frame(self.root, bg="#f0f0f0")
+        canvas_frame = tk.Frame(self.root, bg=BG)
         canvas_frame.pack(fill="both", expand=True)
         
-        canvas = tk.Canvas(canvas_frame, bg="#f0f0f0", highlightthickness=0)
+        canvas = tk.Canvas(canvas_frame, bg=BG, highlightthickness=0)
         scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg="#f0f0f0")
+        scrollable_frame = tk.Frame(canvas, bg=BG)
         
         scrollable_frame.bind(
             "<Configure>",
@@ -406,11 +1245,6 @@ class QuizApp:
         canvas.pack(side="left", fill="both", expand=True, padx=20)
         scrollbar.pack(side="right", fill="y")
         
-        # Bind mouse wheel for scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
         # Display each question with answer
         for i, question in enumerate(current_batch):
             question_idx = start_idx + i
@@ -419,26 +1253,26 @@ class QuizApp:
             is_correct = user_answer == correct_answer
             
             # Question frame
-            q_frame = tk.Frame(scrollable_frame, bg="white", relief="solid", borderwidth=2,
-                             highlightbackground="#4CAF50" if is_correct else "#f44336",
+            q_frame = tk.Frame(scrollable_frame, bg=CARD, relief="solid", borderwidth=2,
+                             highlightbackground=SUCCESS if is_correct else DANGER,
                              highlightthickness=3)
             q_frame.pack(fill="x", pady=10, padx=10)
             
             # Status banner
-            status_frame = tk.Frame(q_frame, bg="#4CAF50" if is_correct else "#f44336", height=30)
+            status_frame = tk.Frame(q_frame, bg=SUCCESS if is_correct else DANGER, height=30)
             status_frame.pack(fill="x")
             status_label = tk.Label(status_frame, 
                                    text="✓ CORRECT" if is_correct else "✗ INCORRECT",
-                                   font=("Arial", 11, "bold"),
-                                   bg="#4CAF50" if is_correct else "#f44336",
-                                   fg="white")
+                                   font=self.fonts["small_bold"],
+                                   bg=SUCCESS if is_correct else DANGER,
+                                   fg=ON_ACCENT)
             status_label.pack(pady=5)
             
             # Question text
             q_label = tk.Label(q_frame, 
                               text=f"Question {question_idx + 1}: {question['question']}", 
-                              font=("Arial", 13, "bold"), 
-                              bg="white", 
+                              font=self.fonts["question"], 
+                              bg=CARD, 
                               wraplength=700,
                               justify="left",
                               anchor="w")
@@ -446,26 +1280,26 @@ class QuizApp:
             
             # Show all choices with indicators
             for j, choice in enumerate(question["choices"]):
-                choice_frame = tk.Frame(q_frame, bg="white")
+                choice_frame = tk.Frame(q_frame, bg=CARD)
                 choice_frame.pack(fill="x", padx=15, pady=2)
                 
                 if j == correct_answer:
                     indicator = "✓"
-                    color = "#4CAF50"
+                    color = SUCCESS
                     weight = "bold"
                 elif j == user_answer and not is_correct:
                     indicator = "✗"
-                    color = "#f44336"
+                    color = DANGER
                     weight = "bold"
                 else:
                     indicator = "○"
-                    color = "#666"
+                    color = MUTED
                     weight = "normal"
                 
                 choice_label = tk.Label(choice_frame, 
                                        text=f"{indicator} {choice}",
-                                       font=("Arial", 11, weight),
-                                       bg="white",
+                                       font=self.fonts["small_bold" if weight == "bold" else "small"],
+                                       bg=CARD,
                                        fg=color,
                                        wraplength=680,
                                        justify="left",
@@ -473,102 +1307,170 @@ class QuizApp:
                 choice_label.pack(anchor="w", padx=20)
             
             # Explanation
-            exp_frame = tk.Frame(q_frame, bg="#e3f2fd")
+            exp_frame = tk.Frame(q_frame, bg=EXPLANATION_BG)
             exp_frame.pack(fill="x", padx=15, pady=10)
             
             exp_title = tk.Label(exp_frame, text="Explanation:", 
-                                font=("Arial", 11, "bold"), 
-                                bg="#e3f2fd", fg="#1976D2")
+                                font=self.fonts["small_bold"], 
+                                bg=EXPLANATION_BG, fg=LINK)
             exp_title.pack(anchor="w", padx=10, pady=(5, 0))
             
             exp_label = tk.Label(exp_frame, 
-                                text=question["explanation"],
-                                font=("Arial", 11),
-                                bg="#e3f2fd",
-                                fg="#333",
+                                text=question.get("explanation") or "(No explanation provided)",
+                                font=self.fonts["small"],
+                                bg=EXPLANATION_BG,
+                                fg=TEXT,
                                 wraplength=680,
                                 justify="left",
                                 anchor="w")
             exp_label.pack(anchor="w", padx=10, pady=(0, 5))
         
         # Navigation buttons
-        button_frame = tk.Frame(self.root, bg="#f0f0f0", height=70)
+        button_frame = tk.Frame(self.root, bg=BG, height=70)
         button_frame.pack(fill="x")
         button_frame.pack_propagate(False)
         
-        btn_container = tk.Frame(button_frame, bg="#f0f0f0")
+        btn_container = tk.Frame(button_frame, bg=BG)
         btn_container.pack(expand=True)
         
-        if end_idx < len(self.questions):
+        if end_idx < self.session_total:
             next_btn = tk.Button(btn_container, 
-                                text="Next 10 Questions →", 
+                                text="Next Question →" if self.batch_size == 1 else f"Next {self.batch_size} Questions →", 
                                 command=self.next_batch,
-                                font=("Arial", 14, "bold"),
-                                bg="#2196F3",
-                                fg="white",
+                                font=self.fonts["large_bold"],
+                                bg=PRIMARY,
+                                fg=ON_ACCENT,
                                 padx=30,
                                 pady=10,
                                 cursor="hand2")
             next_btn.pack(side="left", padx=10)
+            self.default_button = next_btn
         else:
             finish_btn = tk.Button(btn_container, 
                                   text="Finish Quiz", 
                                   command=self.show_final_results,
-                                  font=("Arial", 14, "bold"),
-                                  bg="#4CAF50",
-                                  fg="white",
+                                  font=self.fonts["large_bold"],
+                                  bg=SUCCESS,
+                                  fg=ON_ACCENT,
                                   padx=30,
                                   pady=10,
                                   cursor="hand2")
             finish_btn.pack(side="left", padx=10)
+            self.default_button = finish_btn
         
         restart_btn = tk.Button(btn_container, 
                                text="New Quiz", 
                                command=self.create_start_screen,
-                               font=("Arial", 14),
-                               bg="#f44336",
-                               fg="white",
+                               font=self.fonts["large"],
+                               bg=DANGER,
+                               fg=ON_ACCENT,
                                padx=30,
                                pady=10,
                                cursor="hand2")
         restart_btn.pack(side="left", padx=10)
         
-        # Store canvas reference for cleanup
+        # The mouse wheel scrolls this canvas until the next screen
         self.canvas = canvas
+        
+        try:
+            delay = self.auto_advance.get()
+        except tk.TclError:
+            delay = 0  # Not a number in the spinbox
+        if delay > 0 and len(current_batch) == 1:
+            self.advance_job = self.root.after(delay * 1000, self.default_button.invoke)
+    
+    def show_stats_screen(self, bank_paths):
+        """Per-bank totals and the 20 weakest grammar points"""
+        from datetime import datetime
+        from quiz_stats import accuracy, rolling_accuracy, weakest_points
+        
+        file_keys = [self.get_file_key(p) for p in bank_paths]
+        # Counters come from memory for the open banks, else from the progress file
+        stats = {k: self.stats[k] for k in file_keys if k in self.stats}
+        missing = [k for k in file_keys if k not in stats]
+        if missing:
+            stats.update(self.load_stats(missing))
+        
+        self.clear_window()
+        
+        # Header frame
+        header_frame = tk.Frame(self.root, bg=ACCENT, height=70)
+        header_frame.pack(fill="x")
+        header_frame.pack_propagate(False)
+        
+        title_label = tk.Label(header_frame, text="Statistics", 
+                              font=self.fonts["heading"], bg=ACCENT, fg=ON_ACCENT)
+        title_label.pack(pady=20)
+        
+        content = tk.Frame(self.root, bg=BG)
+        content.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        for file_key, agg in stats.items():
+            bank_label = tk.Label(content, 
+                                 text=f"{file_key}: {agg.bank['correct']}/{agg.bank['attempts']} correct "
+                                      f"({accuracy(agg.bank)*100:.1f}%), last {len(agg.bank['recent'])}: "
+                                      f"{rolling_accuracy(agg.bank)*100:.0f}%", 
+                                 font=self.fonts["small"], bg=BG, fg=TEXT, anchor="w")
+            bank_label.pack(fill="x")
+        
+        table = tk.Frame(content, bg=BG)
+        table.pack(fill="both", expand=True, pady=10)
+        
+        headings = ("Weakest grammar points", "Attempts", "Accuracy", "Recent", "Last seen")
+        for col, heading in enumerate(headings):
+            tk.Label(table, text=heading, font=self.fonts["small_bold"], 
+                     bg=BG, fg=ACCENT, anchor="w").grid(row=0, column=col, sticky="w", padx=6)
+        
+        weakest = weakest_points(stats.values())
+        for row, (point, counter) in enumerate(weakest, start=1):
+            last_seen = datetime.fromtimestamp(counter['last_seen']).strftime("%Y-%m-%d") \
+                if counter['last_seen'] else "-"
+            values = (point, counter['attempts'], f"{accuracy(counter)*100:.0f}%", 
+                      f"{rolling_accuracy(counter)*100:.0f}%", last_seen)
+            for col, value in enumerate(values):
+                tk.Label(table, text=value, font=self.fonts["small"], 
+                         bg=BG, fg=TEXT, anchor="w").grid(row=row, column=col, sticky="w", padx=6)
+        
+        if not weakest:
+            tk.Label(table, text="No answers recorded yet", font=self.fonts["small_italic"], 
+                     bg=BG, fg=FAINT).grid(row=1, column=0, sticky="w", padx=6)
+        
+        back_btn = tk.Button(self.root, text="Back", 
+                            command=self.create_start_screen,
+                            font=self.fonts["large"], bg=PRIMARY, fg=ON_ACCENT,
+                            padx=30, pady=10, cursor="hand2")
+        back_btn.pack(pady=15)
     
     def next_batch(self):
         """Move to next batch of questions"""
-        # Unbind mousewheel from old canvas
-        if hasattr(self, 'canvas'):
-            self.canvas.unbind_all("<MouseWheel>")
-        
-        self.current_batch_idx += 1
+        self.page_start = self.page_end
         self.create_quiz_screen()
     
     def show_final_results(self):
         """Display final quiz results"""
-        # Unbind mousewheel from old canvas
-        if hasattr(self, 'canvas'):
-            self.canvas.unbind_all("<MouseWheel>")
+        # Nothing left to resume
+        self.snapshots.clear()
+        self.composer = None
+        self.page = None
         
         self.clear_window()
         
-        frame = tk.Frame(self.root, bg="#f0f0f0")
+        frame = tk.Frame(self.root, bg=BG)
         frame.place(relx=0.5, rely=0.5, anchor="center")
         
         title_label = tk.Label(frame, text="Quiz Complete!", 
-                              font=("Arial", 28, "bold"), bg="#f0f0f0", fg="#4CAF50")
+                              font=self.fonts["display"], bg=BG, fg=SUCCESS)
         title_label.pack(pady=20)
         
         percentage = (self.total_score / len(self.questions)) * 100
         score_label = tk.Label(frame, 
                               text=f"Final Score: {self.total_score}/{len(self.questions)}", 
-                              font=("Arial", 20), bg="#f0f0f0", fg="#333")
+                              font=self.fonts["score"], bg=BG, fg=TEXT)
         score_label.pack(pady=10)
         
         percentage_label = tk.Label(frame, 
                                    text=f"({percentage:.1f}%)", 
-                                   font=("Arial", 16), bg="#f0f0f0", fg="#666")
+                                   font=self.fonts["subheading"], bg=BG, fg=MUTED)
         percentage_label.pack(pady=5)
         
         # Feedback
@@ -582,55 +1484,116 @@ class QuizApp:
             feedback = "Keep practicing! もっと頑張って!"
         
         feedback_label = tk.Label(frame, text=feedback, 
-                                 font=("Arial", 14, "italic"), bg="#f0f0f0", fg="#2196F3")
+                                 font=self.fonts["large_italic"], bg=BG, fg=PRIMARY)
         feedback_label.pack(pady=20)
         
-        # Show progress info
-        if self.current_file_path:
-            progress = self.load_progress()
-            file_key = self.get_file_key(self.current_file_path)
+        # Show progress info, straight from the manifest
+        progress = self.progress_store().summary()
+        for file_key in self.bank_ranges:
             if file_key in progress:
-                total = progress[file_key].get('total_questions', 0)
-                answered = len(progress[file_key].get('answered', []))
+                total = progress[file_key]['total_questions']
+                answered = progress[file_key]['answered']
+                prefix = f"{file_key}: " if len(self.bank_ranges) > 1 else ""
                 progress_label = tk.Label(frame, 
-                                        text=f"Total Progress: {answered}/{total} questions completed", 
-                                        font=("Arial", 11), bg="#f0f0f0", fg="#666")
+                                        text=f"{prefix}Total Progress: {answered}/{total} questions completed", 
+                                        font=self.fonts["small"], bg=BG, fg=MUTED)
                 progress_label.pack(pady=5)
                 
                 remaining = total - answered
                 if remaining > 0:
                     remaining_label = tk.Label(frame, 
                                              text=f"{remaining} questions remaining in this bank", 
-                                             font=("Arial", 11), bg="#f0f0f0", fg="#FF5722")
+                                             font=self.fonts["small"], bg=BG, fg=REMAINING)
                     remaining_label.pack(pady=2)
         
+        stats_btn = tk.Button(frame, text="View Statistics", 
+                             command=lambda: self.show_stats_screen(self.bank_paths),
+                             font=self.fonts["body"], bg=ACCENT, fg=ON_ACCENT,
+                             padx=20, pady=6, cursor="hand2")
+        stats_btn.pack(pady=5)
+        
         restart_btn = tk.Button(frame, text="Take Another Quiz", 
                                command=self.create_start_screen,
-                               font=("Arial", 14), bg="#2196F3", fg="white",
+                               font=self.fonts["large"], bg=PRIMARY, fg=ON_ACCENT,
                                padx=20, pady=10, cursor="hand2")
         restart_btn.pack(pady=10)
         
         exit_btn = tk.Button(frame, text="Exit", 
                             command=self.root.quit,
-                            font=("Arial", 14), bg="#f44336", fg="white",
+                            font=self.fonts["large"], bg=DANGER, fg=ON_ACCENT,
                             padx=20, pady=10, cursor="hand2")
         exit_btn.pack(pady=5)
     
     def clear_window(self):
         """Clear all widgets from the window"""
-        # Unbind mousewheel before clearing
-        if hasattr(self, 'canvas'):
-            try:
-                self.canvas.unbind_all("<MouseWheel>")
-            except:
-                pass
-        
+        self.canvas = None
+        self.default_button = None
+        if self.advance_job is not None:
+            self.root.after_cancel(self.advance_job)
+            self.advance_job = None
         for widget in self.root.winfo_children():
             widget.destroy()
 
-def main():
+def parse_args(argv=None):
+    """Command-line options; all optional, the start screen is the default"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Japanese Quiz Application")
+    parser.add_argument("banks", nargs="*", help="question bank file(s) to start with, skipping the dialog")
+    parser.add_argument("--resume", action="store_true", help="reopen the last session where it was left off")
+    parser.add_argument("--mode", choices=["single", "batch", "unanswered-first", "unanswered-only"], 
+                        default="unanswered-only", 
+                        help="which questions and how many a page; can be changed while running "
+                             "(default: unanswered-only)")
+    parser.add_argument("--batch-size", type=int, default=10, help="questions per page (default: 10)")
+    parser.add_argument("--auto-advance", type=int, default=0, metavar="SECONDS", 
+                        help="in single mode, go on to the next question this long after the "
+                             "answer is shown (default: 0, wait for Next or Enter)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for question and choice order")
+    parser.add_argument("--difficulty", type=float, default=None, 
+                        help="serve questions closest to this IRT difficulty first (see quiz_irt.py)")
+    parser.add_argument("--bank-dir", default=".", 
+                        help="directory whose banks the start screen lists (default: here)")
+    parser.add_argument("--font-size", type=int, default=BASE_SIZE, 
+                        help="base text size in points; Ctrl +/- changes it while running and "
+                             f"Ctrl 0 goes back to it (default: {BASE_SIZE})")
+    parser.add_argument("--watch", action="store_true", 
+                        help="pick up edits to the open banks while the quiz is running")
+    parser.add_argument("--diagnostics", action="store_true", 
+                        default=os.environ.get("JPQUIZ_DIAGNOSTICS") == "1", 
+                        help="record event-loop stalls (same as JPQUIZ_DIAGNOSTICS=1)")
+    parser.add_argument("--leak-check", action="store_true", 
+                        help="count widgets, callbacks and memory on every screen; "
+                             "report growth to quiz_leaks.log on exit")
+    parser.add_argument("--benchmark", action="store_true", 
+                        help="print the time to the first question and exit")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    return args
+
+def main(argv=None):
+    start_time = time.perf_counter()
+    args = parse_args(argv)
+    
+    bank_paths = args.banks
+    if args.resume and not bank_paths:
+        # Read the last session file without building a window first
+        bank_paths = QuizApp.load_last_session()
+    
     root = tk.Tk()
-    app = QuizApp(root)
+    app = QuizApp(root, diagnostics=args.diagnostics, bank_paths=bank_paths, 
+                  batch_size=args.batch_size, seed=args.seed, target_difficulty=args.difficulty, 
+                  resume=args.resume, watch=args.watch, bank_dir=args.bank_dir, 
+                  font_size=args.font_size, mode=args.mode, leak_check=args.leak_check, 
+                  benchmark=args.benchmark, auto_advance=args.auto_advance)
+    
+    if args.benchmark:
+        root.update()
+        print(f"first screen after {(time.perf_counter() - start_time) * 1000:.1f} ms")
+        root.destroy()
+        return
+    
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,251 @@
+"""Vectorized analytics over the per-answer history (requires NumPy)
+
+    python quiz_analytics.py [--banks questionbank*.txt] [--json summary.json] [--csv outdir]
+    python quiz_analytics.py --benchmark 2000000
+
+The history log is read straight into a NumPy structured array; every
+statistic below is computed with bincount/indexing, never a Python loop
+over answers.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from quiz_history import RECORD
+
+HISTORY_DTYPE = np.dtype([
+    ('timestamp', '<f8'), ('question', '<u4'), ('bank', '<u2'), ('chosen', 'u1'),
+    ('correct', 'u1'), ('shown', 'u1'), ('correct_shown', 'u1'), ('reserved', '<u2'),
+    ('prev', '<i4'),
+])
+assert HISTORY_DTYPE.itemsize == RECORD.size
+
+# Chi-square critical values at the 5% level, by degrees of freedom
+CHI2_CRITICAL_5 = {1: 3.841, 2: 5.991, 3: 7.815, 4: 9.488, 5: 11.070}
+
+
+def load_history(log_path="quiz_history.bin"):
+    """The whole answer log as a structured array (a torn final record is dropped)"""
+    if not os.path.exists(log_path):
+        return np.zeros(0, dtype=HISTORY_DTYPE)
+    count = os.path.getsize(log_path) // HISTORY_DTYPE.itemsize
+    return np.fromfile(log_path, dtype=HISTORY_DTYPE, count=count)
+
+
+def load_bank_names(index_path="quiz_history_index.json"):
+    """{bank id: bank key} from the history index"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return {bank_id: key for key, bank_id in json.load(f).get('banks', {}).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def question_tables(bank_names, bank_paths):
+    """Per-question lookup arrays for the banks that can be found
+
+    Returns (offsets, sizes, grammar_ids, n_choices, grammar_names): the row
+    for answer (bank b, question q) is offsets[b] + q, offsets[b] being -1
+    if bank b was not found.
+    """
+    from quiz_bank import grammar_point, load_bank
+    
+    by_key = {os.path.basename(p): p for p in bank_paths}
+    n_banks = max(bank_names, default=-1) + 1
+    offsets = np.full(n_banks, -1, dtype=np.int64)
+    sizes = np.zeros(n_banks, dtype=np.int64)
+    grammar_ids = []
+    n_choices = []
+    grammar_names = []
+    grammar_lookup = {}
+    total = 0
+    for bank_id in range(n_banks):
+        path = by_key.get(bank_names.get(bank_id))
+        if path is None:
+            continue
+        questions = load_bank(path)
+        offsets[bank_id] = total
+        sizes[bank_id] = len(questions)
+        total += len(questions)
+        for q in questions:
+            point = grammar_point(q["question"])
+            if point not in grammar_lookup:
+                grammar_lookup[point] = len(grammar_names)
+                grammar_names.append(point)
+            grammar_ids.append(grammar_lookup[point])
+            n_choices.append(len(q["choices"]))
+    return (offsets, sizes, np.array(grammar_ids, dtype=np.int64),
+            np.array(n_choices, dtype=np.int64), grammar_names)
+
+
+def _rates(groups, correct, size):
+    attempts = np.bincount(groups, minlength=size)
+    right = np.bincount(groups, weights=correct, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return attempts, right.astype(np.int64), np.where(attempts > 0, right / attempts, np.nan)
+
+
+def analyze(history, bank_names=None, bank_paths=()):
+    """Compute the summary statistics; returns a JSON-serializable dict"""
+    bank_names = bank_names or {}
+    correct = history['correct'].astype(np.float64)
+    summary = {'answers': int(len(history)),
+               'accuracy': float(correct.mean()) if len(history) else None}
+    
+    # Per bank
+    n_banks = int(history['bank'].max()) + 1 if len(history) else 0
+    attempts, right, rate = _rates(history['bank'], correct, n_banks)
+    summary['banks'] = [
+        {'bank': bank_names.get(b, f"#{b}"), 'attempts': int(attempts[b]),
+         'correct': int(right[b]), 'accuracy': float(rate[b])}
+        for b in np.flatnonzero(attempts)
+    ]
+    
+    # Over time, one row per calendar day (UTC)
+    days = (history['timestamp'] // 86400).astype(np.int64)
+    day_values, day_groups = np.unique(days, return_inverse=True)
+    attempts, right, rate = _rates(day_groups, correct, len(day_values))
+    summary['days'] = [
+        {'day': time.strftime("%Y-%m-%d", time.gmtime(int(d) * 86400)), 'attempts': int(a),
+         'correct': int(r), 'accuracy': float(x)}
+        for d, a, r, x in zip(day_values, attempts, right, rate)
+    ]
+    
+    # Which on-screen position was picked, against where the answer was
+    k = int(max(history['shown'].max(), history['correct_shown'].max())) + 1 if len(history) else 0
+    confusion = np.bincount(history['correct_shown'].astype(np.int64) * k + history['shown'],
+                            minlength=k * k).reshape(k, k) if k else np.zeros((0, 0))
+    summary['position_confusion'] = {
+        'rows': "correct position", 'columns': "chosen position", 'matrix': confusion.tolist(),
+    }
+    
+    # Per grammar point, and the expected spread of the correct position,
+    # need the banks themselves
+    summary['grammar_points'] = []
+    offsets, sizes, grammar_ids, n_choices, grammar_names = question_tables(bank_names, bank_paths)
+    known = np.zeros(len(history), dtype=bool)
+    rows = np.zeros(len(history), dtype=np.int64)
+    if len(offsets) and len(history):
+        # Banks the index has no name for (a log newer than its index) are unknown
+        in_table = history['bank'] < len(offsets)
+        bank = np.where(in_table, history['bank'], 0)
+        bank_offset = np.where(in_table, offsets[bank], -1)
+        rows = np.where(bank_offset >= 0, bank_offset + history['question'], 0)
+        known = (bank_offset >= 0) & (history['question'] < sizes[bank])
+    if known.any():
+        known_rows = rows[known]
+        attempts, right, rate = _rates(grammar_ids[known_rows], correct[known],
+                                       len(grammar_names))
+        order = np.lexsort((-attempts, np.nan_to_num(rate, nan=2.0)))
+        summary['grammar_points'] = [
+            {'grammar_point': grammar_names[g], 'attempts': int(attempts[g]),
+             'correct': int(right[g]), 'accuracy': float(rate[g])}
+            for g in order if attempts[g]
+        ]
+    
+    summary['correct_position'] = position_uniformity(
+        history['correct_shown'][known], n_choices[rows[known]] if known.any() else np.zeros(0, np.int64))
+    return summary
+
+
+def position_uniformity(correct_shown, n_choices):
+    """Chi-square check that randomize_choices spreads the correct answer evenly
+
+    Each answer to a question with n choices expects 1/n at each of its positions.
+    """
+    if not len(correct_shown):
+        return {'observed': [], 'expected': [], 'chi2': None, 'uniform_at_5pct': None}
+    k = int(n_choices.max())
+    observed = np.bincount(correct_shown, minlength=k)[:k].astype(np.float64)
+    # expected[p] = sum over answers with more than p choices of 1/n
+    per_n = np.bincount(n_choices, minlength=k + 1).astype(np.float64)
+    share = np.divide(per_n, np.arange(k + 1), out=np.zeros(k + 1), where=np.arange(k + 1) > 0)
+    expected = np.cumsum(share[::-1])[::-1][1:k + 1]
+    mask = expected > 0
+    chi2 = float((((observed - expected) ** 2)[mask] / expected[mask]).sum())
+    dof = int(mask.sum()) - 1
+    critical = CHI2_CRITICAL_5.get(dof)
+    return {'observed': observed.astype(int).tolist(), 'expected': expected.round(2).tolist(),
+            'chi2': round(chi2, 3), 'degrees_of_freedom': dof,
+            'uniform_at_5pct': None if critical is None else chi2 <= critical}
+
+
+def write_csv(summary, out_dir):
+    """One CSV per table in the summary"""
+    os.makedirs(out_dir, exist_ok=True)
+    for name in ('banks', 'days', 'grammar_points'):
+        rows = summary[name]
+        with open(os.path.join(out_dir, f"{name}.csv"), 'w', newline='', encoding='utf-8') as f:
+            if rows:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+    with open(os.path.join(out_dir, "position_confusion.csv"), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        matrix = summary['position_confusion']['matrix']
+        writer.writerow(["correct \\ chosen"] + list(range(len(matrix))))
+        for pos, row in enumerate(matrix):
+            writer.writerow([pos] + row)
+
+
+def synthetic_history(n, n_questions=400, seed=0):
+    """Random answers in the log format, for benchmarking"""
+    rng = np.random.default_rng(seed)
+    history = np.zeros(n, dtype=HISTORY_DTYPE)
+    history['timestamp'] = 1.7e9 + np.sort(rng.uniform(0, 90 * 86400, n))
+    history['question'] = rng.integers(0, n_questions, n)
+    history['correct_shown'] = rng.integers(0, 3, n)
+    history['shown'] = np.where(rng.random(n) < 0.6, history['correct_shown'], rng.integers(0, 3, n))
+    history['correct'] = history['shown'] == history['correct_shown']
+    history['prev'] = -1
+    return history
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer history analytics")
+    parser.add_argument("--history", default="quiz_history.bin")
+    parser.add_argument("--index", default="quiz_history_index.json")
+    parser.add_argument("--banks", nargs="*", default=None,
+                        help="bank files for per-grammar-point stats (default: *.txt here)")
+    parser.add_argument("--json", help="write the summary as JSON to this file")
+    parser.add_argument("--csv", help="write CSV tables into this directory")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="time the analysis on N synthetic answers and exit")
+    args = parser.parse_args(argv)
+    
+    if args.benchmark:
+        history = synthetic_history(args.benchmark)
+        start = time.perf_counter()
+        summary = analyze(history)
+        summary['correct_position'] = position_uniformity(history['correct_shown'],
+                                                          np.full(len(history), 3))
+        print(f"{args.benchmark} answers analyzed in {(time.perf_counter() - start) * 1000:.1f} ms "
+              f"(correct position chi2 {summary['correct_position']['chi2']})")
+        return 0
+    
+    bank_paths = args.banks
+    if bank_paths is None:
+        bank_paths = [f for f in os.listdir(".") if f.endswith((".txt", ".jqb", ".jqz"))]
+    start = time.perf_counter()
+    summary = analyze(load_history(args.history), load_bank_names(args.index), bank_paths)
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    if args.csv:
+        write_csv(summary, args.csv)
+    if not args.json and not args.csv:
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    print(f"{summary['answers']} answers analyzed in {elapsed:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
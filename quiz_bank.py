@@ -0,0 +1,510 @@
+"""Question bank parsing and the compiled bank cache
+
+Parsed banks are pickled under CACHE_DIR, keyed by the bank's size and
+mtime, so reopening an unchanged bank skips the text parse entirely. The
+cache also keeps a hash of every question block, so an edited bank only has
+its changed blocks parsed again.
+
+Explanations are the bulk of a bank but are only needed on the results
+screen, so they are kept out of the question dicts: they are packed into an
+explanation file next to the cache, which is memory-mapped, and read with
+bank_explanations() a batch at a time. The file is named by its content and
+never replaced, so the cache itself can be rewritten while the explanations
+are mapped (Windows refuses to replace a mapped file).
+"""
+import bisect
+import hashlib
+import mmap
+import os
+import pickle
+import re
+import struct
+import threading
+from collections.abc import Sequence
+
+from quiz_io import atomic_file
+
+CACHE_DIR = ".quiz_cache"
+CACHE_VERSION = 6
+
+_memory_cache = {}  # abspath -> cache entry dict
+_lock = threading.Lock()
+
+# Grammar point quoted in the question text: 「～にかかわらず」 or '極まりない'
+GRAMMAR_RE = re.compile(r"「([^」]+)」|'([^']+)'")
+
+# Start of a line that parse_question_bank reads as a new question
+Q_LINE_RE = re.compile(r"^[^\S\n]*Q:", re.MULTILINE)
+
+
+def parse_question_bank(lines, first_line=1):
+    """Parse Q:/A:/B:/C:/Explanation: lines into question dicts
+
+    Each dict also records the line number of its Q: line.
+    """
+    questions = []
+    question = None
+    choices = []
+    correct = None
+    explanation = None
+    q_line = None
+    
+    for lineno, line in enumerate(lines, first_line):
+        line = line.strip()
+        if line.startswith("Q:"):
+            if question:
+                questions.append({
+                    "question": question,
+                    "choices": choices,
+                    "correct": correct,
+                    "explanation": explanation,
+                    "line": q_line
+                })
+            question = line[2:].strip()
+            q_line = lineno
+            choices = []
+            correct = None
+            explanation = None
+        elif line.startswith("A:"):
+            correct = len(choices)
+            choices.append(line[2:].strip())
+        elif line.startswith("B:") or line.startswith("C:"):
+            choices.append(line[2:].strip())
+        elif line.startswith("Explanation:"):
+            explanation = line[12:].strip()
+    
+    if question:
+        questions.append({
+            "question": question,
+            "choices": choices,
+            "correct": correct,
+            "explanation": explanation,
+            "line": q_line
+        })
+    
+    return questions
+
+
+def split_blocks(text):
+    """Split a bank's text into (first_line, text) blocks, each starting at a Q: line
+
+    Text before the first Q: line forms a block of its own.
+    """
+    starts = [m.start() for m in Q_LINE_RE.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    blocks = []
+    first_line = 1
+    for start, end in zip(starts, starts[1:] + [len(text)]):
+        blocks.append((first_line, text[start:end]))
+        first_line += text.count("\n", start, end)
+    return blocks
+
+
+def pack_blocks(digests, counts):
+    """Block hashes and question counts as two bytes objects, to keep the cache small"""
+    return b"".join(digests), bytes(counts)
+
+
+def unpack_blocks(blocks):
+    """(digest, question count) per block, from pack_blocks() output"""
+    digests, counts = blocks
+    return [(digests[i * 8:i * 8 + 8], count) for i, count in enumerate(counts)]
+
+
+def block_hash(block):
+    """Content hash of a block; trailing blank lines do not count"""
+    return hashlib.blake2b(block.rstrip().encode('utf-8'), digest_size=8).digest()
+
+
+def parse_blocks(text, previous=None):
+    """Parse a bank, reusing the questions of blocks unchanged since previous
+
+    previous is an earlier cache entry for the same bank. Returns
+    (questions, blocks), blocks being the packed hash and question count of
+    every block.
+    """
+    blocks = split_blocks(text)
+    digests = [block_hash(block) for _, block in blocks]
+    
+    if not (previous and previous.get('blocks')):
+        # Nothing to reuse: one pass over the whole text, then count each
+        # block's question by its Q: line number
+        questions = parse_question_bank(text.split("\n"))
+        q_lines = {q["line"] for q in questions}
+        return questions, pack_blocks(digests, [int(first_line in q_lines) for first_line, _ in blocks])
+    
+    old_blocks = unpack_blocks(previous['blocks'])
+    old_digests = [digest for digest, _ in old_blocks]
+    old_counts = [count for _, count in old_blocks]
+    old_questions = previous['questions']
+    
+    # Unchanged runs at either end are reused without a hash lookup
+    limit = min(len(blocks), len(old_digests))
+    head = 0
+    while head < limit and digests[head] == old_digests[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and digests[-1 - tail] == old_digests[-1 - tail]:
+        tail += 1
+    head_count = sum(old_counts[:head])
+    tail_count = sum(old_counts[len(old_counts) - tail:])
+    
+    # In between, blocks are matched by hash wherever they moved to
+    reusable = {}
+    pos = head_count
+    for digest, count in zip(old_digests[head:len(old_digests) - tail], old_counts[head:len(old_counts) - tail]):
+        reusable.setdefault(digest, []).append(old_questions[pos:pos + count])
+        pos += count
+    
+    questions = []
+    counts = []
+    
+    def reuse(parsed, first_line):
+        # Same text, but an edit above, even a blank line, may have moved it
+        questions.extend(q if q["line"] == first_line else dict(q, line=first_line) for q in parsed)
+        counts.append(len(parsed))
+    
+    pos = 0
+    for (first_line, _), count in zip(blocks[:head], old_counts[:head]):
+        reuse(old_questions[pos:pos + count], first_line)
+        pos += count
+    for digest, (first_line, block) in zip(digests[head:len(blocks) - tail], blocks[head:len(blocks) - tail]):
+        if reusable.get(digest):
+            reuse(reusable[digest].pop(0), first_line)
+        else:
+            parsed = parse_question_bank(block.split("\n"), first_line=first_line)
+            questions.extend(parsed)
+            counts.append(len(parsed))
+    pos = len(old_questions) - tail_count
+    for (first_line, _), count in zip(blocks[len(blocks) - tail:], old_counts[len(old_counts) - tail:]):
+        reuse(old_questions[pos:pos + count], first_line)
+        pos += count
+    return questions, pack_blocks(digests, counts)
+
+
+def block_mapping(old_entry, new_entry):
+    """New index of each old question, None where its block was edited or removed"""
+    old_questions = old_entry['questions']
+    if not (old_entry.get('blocks') and new_entry.get('blocks')):
+        # No block hashes (.jqb/.jqz banks): match questions by their text
+        new_by_text = {}
+        for i, q in enumerate(new_entry['questions']):
+            new_by_text.setdefault(q["question"], []).append(i)
+        return [new_by_text[q["question"]].pop(0) if new_by_text.get(q["question"]) else None
+                for q in old_questions]
+    
+    new_starts = {}
+    pos = 0
+    for digest, count in unpack_blocks(new_entry['blocks']):
+        new_starts.setdefault(digest, []).append(pos)
+        pos += count
+    mapping = []
+    for digest, count in unpack_blocks(old_entry['blocks']):
+        if new_starts.get(digest):
+            start = new_starts[digest].pop(0)
+            mapping.extend(range(start, start + count))
+        else:
+            mapping.extend([None] * count)
+    return mapping
+
+
+def grammar_point(question_text):
+    """The grammar point a question asks about, or None"""
+    match = GRAMMAR_RE.search(question_text or "")
+    if not match:
+        return None
+    return match.group(1) or match.group(2)
+
+
+def bank_fingerprint(file_path):
+    """Cheap change detector for a bank file: size and mtime"""
+    st = os.stat(file_path)
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+
+def cache_path(file_path):
+    """Location of the compiled cache for a bank file"""
+    abspath = os.path.abspath(file_path)
+    digest = hashlib.sha1(abspath.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{os.path.basename(file_path)}.{digest}.pickle")
+
+
+def explanation_path(file_path, data):
+    """Location of a bank's explanation file holding data, named by its hash"""
+    digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+    return f"{cache_path(file_path)[:-len('.pickle')]}.{digest}.expl"
+
+
+class ExplanationSection(Sequence):
+    """Explanations packed into an explanation file
+
+    Layout: u32 count, count + 1 u32 offsets, UTF-8 text back to back.
+    Strings are decoded from the buffer only when asked for.
+    """
+    
+    def __init__(self, buffer, offset):
+        self.buf = memoryview(buffer)
+        (self.count,) = struct.unpack_from("<I", self.buf, offset)
+        self.data_offset = offset + 4 * (self.count + 2)
+        self.offsets = self.buf[offset + 4:self.data_offset].cast('I')
+    
+    @staticmethod
+    def encode(explanations):
+        encoded = [(text or "").encode('utf-8') for text in explanations]
+        offsets = [0]
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        return struct.pack(f"<I{len(offsets)}I", len(encoded), *offsets) + b"".join(encoded)
+    
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError("explanation index out of range")
+        start = self.data_offset + self.offsets[index]
+        end = self.data_offset + self.offsets[index + 1]
+        return str(self.buf[start:end], 'utf-8') or None
+
+
+def _map_explanations(path):
+    with open(path, 'rb') as f:
+        return ExplanationSection(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), 0)
+
+
+def _read_cache(file_path):
+    try:
+        with open(cache_path(file_path), 'rb') as f:
+            entry = pickle.load(f)
+        if entry.get('version') != CACHE_VERSION:
+            return None
+        if entry.get('explanation_file'):
+            entry['explanations'] = _map_explanations(entry['explanation_file'])
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError, struct.error):
+        return None
+    return entry
+
+
+def _write_explanations(file_path, explanations):
+    """Write a bank's explanation file unless it is there already; returns its path"""
+    data = ExplanationSection.encode(explanations)
+    path = explanation_path(file_path, data)
+    if not os.path.exists(path):
+        with atomic_file(path) as f:
+            f.write(data)
+    # Earlier versions go once nothing maps them any more (at once, but on Windows)
+    prefix = os.path.basename(cache_path(file_path))[:-len('.pickle')] + "."
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(prefix) and name.endswith(".expl") and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+    return path
+
+
+def _write_cache(file_path, entry):
+    """Write an entry; returns the path of its explanation file, if any
+
+    Explanations given as a list are written to a new explanation file; an
+    entry whose explanations are already mapped keeps its file.
+    """
+    explanations = entry.get('explanations')
+    stored = {key: value for key, value in entry.items() if key != 'explanations'}
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        if isinstance(explanations, list):
+            stored['explanation_file'] = _write_explanations(file_path, explanations)
+        # A temp file of its own: catalog workers, the warm-up thread and other
+        # windows can all be writing this bank's cache at the same time
+        with atomic_file(cache_path(file_path)) as f:
+            pickle.dump(stored, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return stored.get('explanation_file')
+    except OSError as e:
+        print(f"Error writing bank cache: {e}")
+        return None
+
+
+def _with_explanations(entry):
+    """A cache entry whose questions carry their explanations again, for re-parsing"""
+    if not entry or not entry.get('blocks') or entry.get('explanations') is None:
+        return entry
+    questions = [dict(q, explanation=text) for q, text in zip(entry['questions'], entry['explanations'])]
+    return dict(entry, questions=questions)
+
+
+def _load_entry(file_path):
+    abspath = os.path.abspath(file_path)
+    fingerprint = bank_fingerprint(abspath)
+    with _lock:
+        cached = _memory_cache.get(abspath)
+        if cached and cached['fingerprint'] == fingerprint:
+            return cached
+        
+        stored = _read_cache(abspath) or cached
+        if abspath.endswith((".jqb", ".jqz")):
+            # Precompiled banks are opened in place; the disk cache only
+            # holds calibration data for them
+            if abspath.endswith(".jqz"):
+                from quiz_packed import PackedBank as bank_class
+            else:
+                from quiz_binary import BinaryBank as bank_class
+            
+            # Explanations stay in the file until asked for
+            entry = {'version': CACHE_VERSION, 'fingerprint': fingerprint,
+                     'questions': bank_class.open(abspath), 'explanations': None, 'issues': []}
+            if stored and stored['fingerprint'] == fingerprint:
+                entry['difficulty'] = stored.get('difficulty')
+        elif stored and stored['fingerprint'] == fingerprint:
+            entry = stored
+        else:
+            from quiz_validate import check_records
+            
+            with open(abspath, 'r', encoding='utf-8') as file:
+                questions, blocks = parse_blocks(file.read(), previous=_with_explanations(stored))
+            # Fast validation runs only when the bank is (re)parsed; its
+            # result is cached along with the questions
+            issues = check_records(questions)
+            explanations = [q.pop("explanation", None) for q in questions]
+            entry = {'version': CACHE_VERSION, 'fingerprint': fingerprint, 'questions': questions,
+                     'explanations': explanations, 'blocks': blocks, 'issues': issues}
+            if stored and stored.get('difficulty'):
+                # Keep calibrated difficulties of questions that survived the edit,
+                # at their new indices, as the progress and history are remapped
+                difficulty = [None] * len(questions)
+                for value, new in zip(stored['difficulty'], block_mapping(stored, entry)):
+                    if new is not None:
+                        difficulty[new] = value
+                entry['difficulty'] = difficulty
+            explanation_file = _write_cache(abspath, entry)
+            if explanation_file is not None:
+                # Read them back through the mapping instead of keeping them in memory
+                try:
+                    entry['explanations'] = _map_explanations(explanation_file)
+                    entry['explanation_file'] = explanation_file
+                except (OSError, ValueError):
+                    pass
+        
+        _memory_cache[abspath] = entry
+        return entry
+
+
+def load_bank(file_path):
+    """Load a bank through the memory and disk caches, parsing only on a miss
+
+    The returned list is shared between callers and must not be mutated.
+    Its questions have no "explanation"; see bank_explanations().
+    """
+    return _load_entry(file_path)['questions']
+
+
+def bank_explanations(file_path, indices):
+    """Explanations of the given questions of a bank (None where missing)"""
+    entry = _load_entry(file_path)
+    if entry['explanations'] is None:
+        bank = entry['questions']  # .jqb/.jqz: straight from the file
+        return [bank.explanation(i) for i in indices]
+    return [entry['explanations'][i] or None for i in indices]
+
+
+def reload_bank(file_path, old_questions):
+    """Pick up edits to a bank whose questions the caller holds as old_questions
+
+    Returns None if the file is unchanged, else (questions, mapping) where
+    mapping[i] is the new index of old question i, or None if that question
+    was edited or removed.
+    """
+    abspath = os.path.abspath(file_path)
+    old = _memory_cache.get(abspath)
+    entry = _load_entry(abspath)
+    if entry['questions'] is old_questions:
+        return None
+    if old is None or old['questions'] is not old_questions:
+        old = {'questions': old_questions}  # Reloaded elsewhere since: match by text
+    return entry['questions'], block_mapping(old, entry)
+
+
+def bank_issues(file_path):
+    """Fast-mode validation issues found when the bank was last parsed"""
+    return _load_entry(file_path)['issues']
+
+
+def bank_difficulty(file_path):
+    """Calibrated difficulty per question (None where uncalibrated), or None"""
+    return _load_entry(file_path).get('difficulty')
+
+
+def set_bank_difficulty(file_path, difficulty):
+    """Store calibrated difficulties in the bank cache"""
+    entry = _load_entry(file_path)
+    with _lock:
+        entry['difficulty'] = list(difficulty)
+        if isinstance(entry['questions'], list):
+            _write_cache(file_path, entry)
+        else:
+            _write_cache(file_path, {key: value for key, value in entry.items() if key != 'questions'})
+
+
+def is_playable(question):
+    """True if a question can be shown: it has a correct answer among 2+ choices"""
+    return question["correct"] is not None and len(question["choices"]) >= 2
+
+
+def playable_indices(bank):
+    """Indices of the playable questions in a bank"""
+    if hasattr(bank, 'playable_indices'):
+        return bank.playable_indices()
+    return [i for i, q in enumerate(bank) if is_playable(q)]
+
+
+class BankChain(Sequence):
+    """Several banks viewed as one sequence without copying their questions"""
+    
+    def __init__(self, banks=()):
+        self.banks = []
+        self.starts = []
+        self.total = 0
+        for bank in banks:
+            self.append(bank)
+    
+    def append(self, bank):
+        """Add a bank at the end; returns its (start, end) range"""
+        start = self.total
+        self.banks.append(bank)
+        self.starts.append(start)
+        self.total += len(bank)
+        return start, self.total
+    
+    def __len__(self):
+        return self.total
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.total))]
+        if index < 0:
+            index += self.total
+        if not 0 <= index < self.total:
+            raise IndexError("question index out of range")
+        b = bisect.bisect_right(self.starts, index) - 1
+        return self.banks[b][index - self.starts[b]]
+    
+    def playable_indices(self):
+        indices = []
+        for start, bank in zip(self.starts, self.banks):
+            indices.extend(start + i for i in playable_indices(bank))
+        return indices
+
+
+def warm_cache(paths):
+    """Load banks into the memory cache on a background thread"""
+    def _warm():
+        for path in paths:
+            try:
+                load_bank(path)
+            except Exception:
+                pass  # The foreground load reports real errors
+    
+    thread = threading.Thread(target=_warm, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,159 @@
+"""Lazy question selection, one batch at a time
+
+LazySampler draws from a population without replacement with an incremental
+Fisher-Yates shuffle that only touches the positions it draws, so the cost of
+a batch depends on the batch size, not on how many questions are left.
+
+SamplerChain puts one sampler after another, e.g. the unanswered questions
+first and the answered ones after them.
+
+BatchComposer fills each batch from the sampler while keeping grammar points
+apart: a question whose grammar point is already in the batch is set aside
+for a later batch, and only used in this one when nothing else is left.
+"""
+
+
+class LazySampler:
+    """Draw items from population in random order, on demand
+
+    The population is never copied; drawn positions are swapped in a
+    small dict instead of in the sequence itself.
+    """
+    
+    def __init__(self, population, rng, shuffle=True):
+        self.population = population
+        self.rng = rng
+        self.shuffle = shuffle
+        self.pos = 0  # Items drawn so far
+        self.swaps = {}  # position -> position whose item now lives there
+    
+    def __len__(self):
+        """Items not drawn yet"""
+        return len(self.population) - self.pos
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        n = len(self.population)
+        if self.pos >= n:
+            raise StopIteration
+        i = self.pos
+        if self.shuffle:
+            j = self.rng.randrange(i, n)
+            # Swap positions i and j of the virtual permutation
+            at_j = self.swaps.get(j, j)
+            self.swaps[j] = self.swaps.pop(i, i)
+            item = self.population[at_j]
+        else:
+            item = self.population[i]
+        self.pos += 1
+        return item
+    
+    def remaining(self):
+        """Items not drawn yet, in the order they would be drawn if not shuffled"""
+        return [self.population[self.swaps.get(i, i)] for i in range(self.pos, len(self.population))]
+    
+    def get_state(self):
+        return {'pos': self.pos, 'swaps': list(self.swaps.items()), 'shuffle': self.shuffle}
+    
+    def set_state(self, state):
+        self.pos = state['pos']
+        self.swaps = dict(state['swaps'])
+        self.shuffle = state['shuffle']
+
+
+class SamplerChain:
+    """Several samplers drawn one after another: all of the first, then the next, ..."""
+    
+    def __init__(self, samplers):
+        self.samplers = samplers
+    
+    def __len__(self):
+        return sum(len(sampler) for sampler in self.samplers)
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        for sampler in self.samplers:
+            if len(sampler):
+                return next(sampler)
+        raise StopIteration
+    
+    def remaining(self):
+        return [idx for sampler in self.samplers for idx in sampler.remaining()]
+    
+    def get_state(self):
+        return {'samplers': [sampler.get_state() for sampler in self.samplers]}
+    
+    def set_state(self, state):
+        for sampler, sampler_state in zip(self.samplers, state['samplers']):
+            sampler.set_state(sampler_state)
+
+
+class BatchComposer:
+    """Compose batches from a sampler without repeating a grammar point"""
+    
+    def __init__(self, sampler, key, batch_size, lookahead=4):
+        self.sampler = sampler
+        self.key = key
+        self.batch_size = batch_size
+        # Draws per batch before giving up on finding distinct grammar points
+        self.max_draws = batch_size * lookahead
+        self.deferred = []  # Drawn but set aside, oldest first
+    
+    def __len__(self):
+        """Questions not yet placed in a batch"""
+        return len(self.sampler) + len(self.deferred)
+    
+    def next_batch(self):
+        batch = []
+        keys = set()
+        skipped = []
+        
+        def place(idx):
+            batch.append(idx)
+            keys.add(self.key(idx))
+        
+        # Questions set aside earlier go first if they fit now
+        for idx in self.deferred:
+            if len(batch) < self.batch_size and self.key(idx) not in keys:
+                place(idx)
+            else:
+                skipped.append(idx)
+        
+        draws = 0
+        while len(batch) < self.batch_size and draws < self.max_draws:
+            try:
+                idx = next(self.sampler)
+            except StopIteration:
+                break
+            draws += 1
+            if self.key(idx) in keys:
+                skipped.append(idx)
+            else:
+                place(idx)
+        
+        # No distinct grammar point available: repeats are unavoidable
+        while len(batch) < self.batch_size and skipped:
+            place(skipped.pop(0))
+        while len(batch) < self.batch_size:
+            try:
+                place(next(self.sampler))
+            except StopIteration:
+                break
+        
+        self.deferred = skipped
+        return batch
+    
+    def remaining(self):
+        """Questions not yet placed in a batch"""
+        return self.deferred + self.sampler.remaining()
+    
+    def get_state(self):
+        return {'sampler': self.sampler.get_state(), 'deferred': list(self.deferred)}
+    
+    def set_state(self, state):
+        self.sampler.set_state(state['sampler'])
+        self.deferred = list(state['deferred'])
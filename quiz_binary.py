@@ -0,0 +1,185 @@
+"""Binary precompiled bank format (.jqb)
+
+Layout, all integers little-endian:
+
+    header      HEADER struct (magic, version, counts, section offsets)
+    string idx  (string_count + 1) u32 offsets into the string data
+    string data deduplicated UTF-8 strings, back to back
+    records     question_count fixed-width RECORD structs
+    grammar     grammar_count GRAMMAR structs (name, first member, member count)
+    members     u32 question indices, grouped by grammar point
+
+Strings are referenced by index, so a record never moves when text changes
+length. BinaryBank reads the file through a memoryview (over an mmap where
+possible) and only decodes the strings of the questions actually used.
+"""
+import mmap
+import struct
+from collections.abc import Sequence
+
+MAGIC = b"JQB1"
+VERSION = 1
+MAX_CHOICES = 4
+NONE = 0xFFFFFFFF
+NO_ANSWER = 0xFF
+
+# magic, version, reserved, questions, strings, grammar points,
+# string index offset, string data offset, records offset, grammar offset, members offset
+HEADER = struct.Struct("<4sHHIIIIIIII")
+# question sid, explanation sid, grammar id, source line, choice count, correct, reserved, choice sids
+RECORD = struct.Struct(f"<IIIIBBH{MAX_CHOICES}I")
+# name sid, first member, member count
+GRAMMAR = struct.Struct("<III")
+
+
+def map_file(file_path):
+    """Read-only mmap of a file (its bytes if it is empty)"""
+    with open(file_path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file cannot be mapped
+            return f.read()
+
+
+class StringTable:
+    """Deduplicating string table builder"""
+    
+    def __init__(self):
+        self.ids = {}
+        self.encoded = []
+    
+    def add(self, text):
+        if text is None:
+            return NONE
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.encoded)
+            self.encoded.append(text.encode('utf-8'))
+        return sid
+
+
+def encode_bank(questions):
+    """Serialize parsed question dicts to .jqb bytes"""
+    from quiz_bank import grammar_point
+    
+    strings = StringTable()
+    records = bytearray()
+    grammar_ids = {}
+    members = []
+    
+    for idx, q in enumerate(questions):
+        if len(q["choices"]) > MAX_CHOICES:
+            raise ValueError(f"question at line {q.get('line')} has more than {MAX_CHOICES} choices")
+        point = grammar_point(q["question"])
+        gid = NONE
+        if point is not None:
+            gid = grammar_ids.get(point)
+            if gid is None:
+                gid = grammar_ids[point] = len(members)
+                members.append((strings.add(point), []))
+            members[gid][1].append(idx)
+        choice_sids = [strings.add(c) for c in q["choices"]]
+        choice_sids += [NONE] * (MAX_CHOICES - len(choice_sids))
+        records += RECORD.pack(
+            strings.add(q["question"]), strings.add(q["explanation"]), gid,
+            q.get("line") or 0, len(q["choices"]),
+            NO_ANSWER if q["correct"] is None else q["correct"], 0, *choice_sids)
+    
+    string_offsets = [0]
+    for data in strings.encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+    string_index = struct.pack(f"<{len(string_offsets)}I", *string_offsets)
+    string_data = b"".join(strings.encoded)
+    
+    grammar = bytearray()
+    member_ids = []
+    for name_sid, question_ids in members:
+        grammar += GRAMMAR.pack(name_sid, len(member_ids), len(question_ids))
+        member_ids.extend(question_ids)
+    member_data = struct.pack(f"<{len(member_ids)}I", *member_ids)
+    
+    index_offset = HEADER.size
+    data_offset = index_offset + len(string_index)
+    records_offset = data_offset + len(string_data)
+    grammar_offset = records_offset + len(records)
+    members_offset = grammar_offset + len(grammar)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(questions), len(strings.encoded), len(members),
+                         index_offset, data_offset, records_offset, grammar_offset, members_offset)
+    return b"".join([header, string_index, string_data, bytes(records), bytes(grammar), member_data])
+
+
+def write_binary_bank(questions, out_path):
+    """Write questions to a .jqb file"""
+    with open(out_path, 'wb') as f:
+        f.write(encode_bank(questions))
+
+
+class BinaryBank(Sequence):
+    """Read-only question sequence backed by a .jqb buffer
+
+    Items are built on access as the same dicts the text parser produces,
+    except that the explanation is left out; explanation() reads it.
+    """
+    
+    def __init__(self, buffer):
+        self.buf = memoryview(buffer)
+        (magic, version, _, self.count, self.string_count, self.grammar_count,
+         index_offset, self.data_offset, self.records_offset,
+         self.grammar_offset, self.members_offset) = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a .jqb question bank")
+        if version != VERSION:
+            raise ValueError(f"unsupported .jqb version {version}")
+        self.string_index = self.buf[index_offset:self.data_offset].cast('I')
+    
+    @classmethod
+    def open(cls, file_path):
+        """Map a .jqb file into memory without copying it"""
+        return cls(map_file(file_path))
+    
+    def string(self, sid):
+        """Decode one string straight out of the buffer"""
+        if sid == NONE:
+            return None
+        start = self.data_offset + self.string_index[sid]
+        end = self.data_offset + self.string_index[sid + 1]
+        return str(self.buf[start:end], 'utf-8')
+    
+    def record(self, index):
+        return RECORD.unpack_from(self.buf, self.records_offset + index * RECORD.size)
+    
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("question index out of range")
+        q_sid, _, gid, line, n_choices, correct, _, *choice_sids = self.record(index)
+        return {
+            "question": self.string(q_sid),
+            "choices": [self.string(sid) for sid in choice_sids[:n_choices]],
+            "correct": None if correct == NO_ANSWER else correct,
+            "line": line,
+        }
+    
+    def explanation(self, index):
+        return self.string(self.record(index)[1])
+    
+    def playable_indices(self):
+        """Indices of questions with a correct answer, read without decoding text"""
+        records = self.buf[self.records_offset:self.grammar_offset]
+        return [i for i, rec in enumerate(RECORD.iter_unpack(records))
+                if rec[5] != NO_ANSWER and rec[4] >= 2]
+    
+    def grammar_points(self):
+        """{grammar point: [question index, ...]} from the grammar section"""
+        members = self.buf[self.members_offset:].cast('I')
+        points = {}
+        for g in range(self.grammar_count):
+            name_sid, first, count = GRAMMAR.unpack_from(self.buf, self.grammar_offset + g * GRAMMAR.size)
+            points[self.string(name_sid)] = list(members[first:first + count])
+        return points
@@ -0,0 +1,141 @@
+"""Catalog of the question banks in a directory
+
+    python quiz_catalog.py [directory] [--jobs N]
+
+For every bank file (.txt, .jqb, .jqz) the catalog records its question
+count, playable count, grammar points, fingerprint and modification time,
+so the start screen can list a whole bank collection without opening a
+single bank. A refresh only stats the files and re-indexes the new and
+changed ones, several at a time in a process pool; each worker loads its
+bank through the compiled cache, so the banks also open fast afterwards.
+The workers are spawned, not forked: the quiz refreshes from a thread of a
+running Tk process, which a fork would copy mid-flight.
+
+The catalog is one JSON file under the bank cache directory, keyed by
+absolute path, written atomically under a lock like the progress files.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from quiz_bank import CACHE_DIR
+from quiz_io import FileLock, atomic_write_json, load_json, set_aside
+
+CATALOG_PATH = os.path.join(CACHE_DIR, "catalog.json")
+BANK_EXTENSIONS = (".txt", ".jqb", ".jqz")
+
+
+def bank_files(directory):
+    """Absolute paths of the bank files directly in directory, sorted"""
+    directory = os.path.abspath(directory)
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return sorted(os.path.join(directory, name) for name in names
+                  if name.endswith(BANK_EXTENSIONS) and os.path.isfile(os.path.join(directory, name)))
+
+
+def index_bank(path):
+    """Catalog row for one bank; runs in a worker process"""
+    from quiz_bank import bank_fingerprint, grammar_point, load_bank, playable_indices
+    
+    try:
+        # Taken before the load, so an edit made meanwhile is indexed next time
+        row = {'name': os.path.basename(path), 'fingerprint': bank_fingerprint(path),
+               'mtime': os.path.getmtime(path)}
+    except OSError:
+        return path, None  # Deleted since the listing
+    try:
+        bank = load_bank(path)
+        points = bank.grammar_points() if hasattr(bank, 'grammar_points') else None
+        if points is None:
+            points = {}
+            for q in bank:
+                point = grammar_point(q["question"])
+                if point is not None:
+                    points[point] = True
+        row.update(questions=len(bank), playable=len(playable_indices(bank)),
+                   grammar_points=list(points))
+    except (OSError, ValueError) as e:  # Not UTF-8, not a bank, ...
+        row.update(questions=0, playable=0, grammar_points=[], error=str(e))
+    return path, row
+
+
+def read_catalog(directory=".", path=CATALOG_PATH):
+    """The catalog rows of directory's banks as last indexed, without refreshing"""
+    try:
+        catalog = load_json(path)
+    except ValueError:
+        return {}
+    directory = os.path.abspath(directory)
+    return {p: row for p, row in catalog.items() if os.path.dirname(p) == directory}
+
+
+def refresh_catalog(directory=".", jobs=None, path=CATALOG_PATH):
+    """Re-index the new and changed banks in directory; returns {path: row}"""
+    from quiz_bank import bank_fingerprint
+    
+    paths = bank_files(directory)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with FileLock(path):
+        try:
+            catalog = load_json(path)
+        except ValueError as e:
+            print(f"Error reading {path}: {e}")
+            set_aside(path)
+            catalog = {}
+        
+        stale = []
+        for p in paths:
+            try:
+                if catalog.get(p, {}).get('fingerprint') != bank_fingerprint(p):
+                    stale.append(p)
+            except OSError:
+                pass  # Deleted since the listing
+        gone = [p for p in catalog if os.path.dirname(p) == os.path.abspath(directory) and p not in paths]
+        
+        if stale or gone:
+            if len(stale) <= 1 or jobs == 1:
+                rows = list(map(index_bank, stale))
+            else:
+                with ProcessPoolExecutor(max_workers=jobs,
+                                         mp_context=multiprocessing.get_context("spawn")) as pool:
+                    rows = list(pool.map(index_bank, stale))
+            catalog.update((p, row) for p, row in rows if row is not None)
+            for p in gone:
+                del catalog[p]
+            try:
+                atomic_write_json(path, catalog)
+            except OSError as e:
+                print(f"Error saving bank catalog: {e}")
+    return {p: catalog[p] for p in paths if p in catalog}
+
+
+def refresh_in_background(directory=".", jobs=None):
+    """Start refresh_catalog on a thread; returns its Future"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(refresh_catalog, directory, jobs)
+    executor.shutdown(wait=False)
+    return future
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index the question banks in a directory")
+    parser.add_argument("directory", nargs="?", default=".", help="bank directory (default: here)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    
+    for path, row in refresh_catalog(args.directory, jobs=args.jobs).items():
+        if row.get('error'):
+            print(f"{row['name']}: {row['error']}")
+        else:
+            print(f"{row['name']}: {row['questions']} questions ({row['playable']} playable), "
+                  f"{len(row['grammar_points'])} grammar points")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Convert text question banks to the binary distribution formats
+
+    python quiz_convert.py questionbankjp02.txt [more.txt ...] [-o out.jqb]
+    python quiz_convert.py big_archive.txt --format jqz [--block-size 32]
+
+.jqb opens fastest; .jqz is block-compressed for large archives. Without -o
+each bank is written next to its source with the format's extension; with
+-o the format follows the output's extension.
+"""
+import argparse
+import os
+import sys
+import time
+
+from quiz_bank import parse_question_bank
+from quiz_validate import check_records
+
+
+def convert(src_path, out_path, block_size=None):
+    """Parse one text bank and write it in binary form, .jqz if out_path says so"""
+    with open(src_path, 'r', encoding='utf-8') as f:
+        questions = parse_question_bank(f)
+    for issue in check_records(questions):
+        print(issue.format(src_path), file=sys.stderr)
+    if out_path.endswith(".jqz"):
+        from quiz_packed import BLOCK_SIZE, write_packed_bank
+        write_packed_bank(questions, out_path, block_size or BLOCK_SIZE)
+    else:
+        from quiz_binary import write_binary_bank
+        write_binary_bank(questions, out_path)
+    return len(questions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert .txt question banks to .jqb or .jqz")
+    parser.add_argument("banks", nargs="+", help="question bank .txt files")
+    parser.add_argument("-o", "--output", help="output file (only with a single input bank)")
+    parser.add_argument("--format", choices=["jqb", "jqz"], default="jqb",
+                        help="output format without -o (default: jqb)")
+    parser.add_argument("--block-size", type=int, help="questions per compressed .jqz block (default: 32)")
+    args = parser.parse_args(argv)
+    if args.output and len(args.banks) > 1:
+        parser.error("-o can only be used with a single input bank")
+    if args.block_size is not None and args.block_size < 1:
+        parser.error("--block-size must be at least 1")
+    
+    for src_path in args.banks:
+        out_path = args.output or os.path.splitext(src_path)[0] + "." + args.format
+        start = time.perf_counter()
+        count = convert(src_path, out_path, args.block_size)
+        print(f"{src_path} -> {out_path}: {count} questions, "
+              f"{os.path.getsize(src_path)} -> {os.path.getsize(out_path)} bytes "
+              f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""Grade a class's answer sheets against a bank at once (requires NumPy)
+
+    python quiz_grade.py questionbankjp02.txt sheets.csv [--json report.json] [--csv outdir]
+    python quiz_grade.py questionbankjp02.txt --benchmark 5000
+
+Every student gets the questions with the choices in an order of their own,
+as randomize_choices shuffles them in the quiz. A sheet records, for each
+question, its index in the bank, the order its choices were shown in (the
+original letters, e.g. "CAB"; empty for the bank's order) and the letter the
+student picked on their own sheet (empty if left blank). An order must name
+each of the question's choices exactly once. As CSV, one row per answer:
+
+    student,question,order,answer
+    aiko,12,CAB,B
+
+as JSON Lines, one sheet per line:
+
+    {"student": "aiko", "answers": [{"question": 12, "order": "CAB", "answer": "B"}, ...]}
+
+All the answers are graded together, the way show_answers checks one: the
+picked position is mapped back through the order to the original choice and
+compared with the bank's answer, for every answer at once with NumPy
+indexing. The report has each student's score and each question's
+difficulty (the share of students who got it right), discrimination (how
+well it separates students who did well on the rest of the sheet from those
+who did not) and how often each original choice was picked.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+LETTERS = "ABCDEFGHIJ"
+BLANK = "@"  # Letter before "A": an empty answer or a padded order decodes to -1
+
+
+def read_sheets(path):
+    """(students, student, question, order, answer) columns of a CSV or JSONL file
+
+    students lists the names in order of appearance; the other columns have
+    one entry per answer, student holding indices into students.
+    """
+    student, question, order, answer = [], [], [], []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.endswith((".jsonl", ".json")):
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    sheet = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path} line {line_no}: {e}")
+                name = str(sheet.get('student', line_no))
+                for item in sheet.get('answers', []):
+                    student.append(name)
+                    question.append(str(item.get('question')))
+                    order.append(item.get('order') or "")
+                    answer.append(item.get('answer') or "")
+        else:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            missing = {'student', 'question', 'answer'} - set(header)
+            if missing:
+                raise ValueError(f"{path}: missing column(s) {', '.join(sorted(missing))}")
+            rows = [row for row in reader if row]
+            if any(len(row) != len(header) for row in rows):
+                raise ValueError(f"{path}: every row needs {len(header)} fields")
+            # One column at a time, rather than a dict per row
+            columns = dict(zip(header, zip(*rows))) if rows else {}
+            student = list(columns.get('student', ()))
+            question = list(columns.get('question', ()))
+            order = list(columns.get('order', ())) or [""] * len(rows)
+            answer = list(columns.get('answer', ()))
+    try:
+        question = np.array(question, dtype=np.str_).astype(np.int64)
+    except ValueError:
+        raise ValueError(f"{path}: every question must be a bank index")
+    # Names numbered in order of first appearance
+    names, first, inverse = np.unique(np.array(student, dtype=np.str_), return_index=True,
+                                      return_inverse=True)
+    appearance = np.argsort(first)
+    rank = np.empty(len(names), dtype=np.int64)
+    rank[appearance] = np.arange(len(names))
+    return names[appearance].tolist(), rank[inverse.reshape(-1)], question, order, answer
+
+
+def letter_codes(strings, width):
+    """Letters as 0-based positions, one row of width per string; padding and blanks are -1
+
+    Strings longer than width are an error, not cut short.
+    """
+    strings = [s.strip().upper() for s in strings]
+    for s in strings:
+        if len(s) > width:
+            raise ValueError(f"{s!r} has more than {width} letter(s)")
+    text = "".join(s.ljust(width, BLANK) for s in strings)
+    codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8).astype(np.int64) - ord("A")
+    return codes.reshape(len(strings), width)
+
+
+def answer_key(bank):
+    """(correct, n_choices) per bank question; correct is -1 where there is none"""
+    correct = np.array([-1 if q["correct"] is None else q["correct"] for q in bank], dtype=np.int64)
+    n_choices = np.array([len(q["choices"]) for q in bank], dtype=np.int64)
+    return correct, n_choices
+
+
+def grade(correct, n_choices, student, question, order, shown, n_students):
+    """Score every answer at once; returns (per-student dict, per-question dict) of arrays
+
+    order[i] lists the original positions of the choices as shown on answer
+    i's sheet (-1 padding), shown[i] is the picked position on that sheet
+    (-1 if blank). An order that is not a permutation of its question's
+    choices, or a pick past its last choice, is an error.
+    """
+    n_questions = len(correct)
+    if len(question) and (question.min() < 0 or question.max() >= n_questions):
+        bad = question[(question < 0) | (question >= n_questions)][0]
+        raise ValueError(f"question {bad} is not in the bank ({n_questions} questions)")
+    width = order.shape[1]
+    # An empty order is the bank's own order
+    identity = (order == -1).all(axis=1)
+    order = np.where(identity[:, None], np.arange(width), order)
+    
+    # Sorted, a valid order is the padding, then 0 .. n - 1: every choice
+    # once, none past the question's last (which would count under another)
+    n = n_choices[question][:, None]
+    padding = width - np.minimum(n, width)
+    expected = np.where(np.arange(width) < padding, -1, np.arange(width) - padding)
+    too_few = n[:, 0] > width  # Too narrow to name them all
+    invalid = ~identity & (too_few | (np.sort(order, axis=1) != expected).any(axis=1))
+    if invalid.any():
+        i = int(np.flatnonzero(invalid)[0])
+        letters = "".join(chr(ord("A") + c) for c in order[i] if c != -1)
+        raise ValueError(f"answer {i + 1}: order {letters!r} does not list the "
+                         f"{int(n[i, 0])} choices of question {int(question[i])} once each")
+    
+    # A letter past the question's last choice is a mistake on the sheet, not a blank
+    stray = (shown != -1) & ((shown < 0) | (shown >= n[:, 0]))
+    if stray.any():
+        i = int(np.flatnonzero(stray)[0])
+        raise ValueError(f"answer {i + 1}: {chr(ord('A') + int(shown[i]))!r} is not one of the "
+                         f"{int(n[i, 0])} choices of question {int(question[i])}")
+    
+    gradable = correct[question] >= 0
+    answered = (shown >= 0) & (shown < np.minimum(n_choices[question], width))
+    chosen = np.where(answered, order[np.arange(len(shown)), np.clip(shown, 0, width - 1)], -1)
+    is_correct = (answered & gradable & (chosen == correct[question])).astype(np.float64)
+    
+    # Per student
+    total = np.bincount(student, weights=gradable, minlength=n_students)
+    right = np.bincount(student, weights=is_correct, minlength=n_students)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        students = {'questions': total.astype(np.int64),
+                    'answered': np.bincount(student, weights=answered & gradable,
+                                            minlength=n_students).astype(np.int64),
+                    'correct': right.astype(np.int64),
+                    'score': np.where(total > 0, right / total, np.nan)}
+    
+    # Per question: difficulty, and the correlation of getting it right with
+    # the score on the rest of the sheet, from per-question sums
+    q, x = question[gradable], is_correct[gradable]
+    rest = (right[student] - is_correct)[gradable]
+    n = np.bincount(q, minlength=n_questions).astype(np.float64)
+    sx, sy = np.bincount(q, x, n_questions), np.bincount(q, rest, n_questions)
+    sxy, syy = np.bincount(q, x * rest, n_questions), np.bincount(q, rest * rest, n_questions)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = sxy / n - (sx / n) * (sy / n)
+        spread = np.sqrt((sx / n) * (1 - sx / n) * (syy / n - (sy / n) ** 2))
+        questions = {'attempts': n.astype(np.int64), 'correct': sx.astype(np.int64),
+                     'difficulty': np.where(n > 0, sx / n, np.nan),
+                     'discrimination': np.where(spread > 0, covariance / spread, np.nan)}
+    picked = answered & gradable & (chosen >= 0)
+    k = max(int(n_choices.max()) if n_questions else 0, width)
+    questions['choices'] = np.bincount(question[picked] * k + chosen[picked],
+                                       minlength=n_questions * k).reshape(n_questions, k)
+    return students, questions
+
+
+def _number(value, digits=3):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def report(bank, names, students, questions):
+    """JSON-serializable report: one row per student, one per question answered"""
+    from quiz_bank import grammar_point
+    
+    student_rows = [
+        {'student': name, 'questions': int(students['questions'][s]),
+         'answered': int(students['answered'][s]), 'correct': int(students['correct'][s]),
+         'score': _number(students['score'][s])}
+        for s, name in enumerate(names)
+    ]
+    question_rows = []
+    for q in np.flatnonzero(questions['attempts']):
+        question = bank[int(q)]
+        question_rows.append({
+            'question': int(q), 'grammar_point': grammar_point(question["question"]),
+            'answer': LETTERS[question["correct"]], 'attempts': int(questions['attempts'][q]),
+            'correct': int(questions['correct'][q]), 'difficulty': _number(questions['difficulty'][q]),
+            'discrimination': _number(questions['discrimination'][q]),
+            'choices': {LETTERS[c]: int(questions['choices'][q, c]) for c in range(len(question["choices"]))},
+        })
+    return {'students': student_rows, 'questions': question_rows}
+
+
+def write_csv(result, out_dir):
+    """students.csv and questions.csv"""
+    os.makedirs(out_dir, exist_ok=True)
+    for name in ('students', 'questions'):
+        rows = result[name]
+        if name == 'questions':
+            rows = [dict(row, choices=" ".join(f"{c}:{n}" for c, n in row['choices'].items())) for row in rows]
+        with open(os.path.join(out_dir, f"{name}.csv"), 'w', newline='', encoding='utf-8') as f:
+            if rows:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+
+
+def synthetic_sheets(n_students, correct, n_choices, per_sheet=40, seed=0):
+    """Random sheets in the grade() layout, for benchmarking"""
+    rng = np.random.default_rng(seed)
+    n = n_students * per_sheet
+    width = int(n_choices.max())
+    student = np.repeat(np.arange(n_students), per_sheet)
+    question = rng.integers(0, len(correct), n)
+    # A shuffle of each question's own choices, padded with -1
+    beyond = np.arange(width) >= n_choices[question][:, None]
+    order = np.argsort(np.where(beyond, np.inf, rng.random((n, width))), axis=1)
+    order[beyond] = -1
+    # Abler students pick the right choice more often
+    ability = rng.uniform(0.3, 0.95, n_students)[student]
+    right_shown = np.argmax(order == correct[question][:, None], axis=1)
+    guess = rng.integers(0, n_choices[question])
+    shown = np.where(rng.random(n) < ability, right_shown, guess)
+    return student, question, order, shown
+
+
+def main(argv=None):
+    from quiz_bank import load_bank
+    
+    parser = argparse.ArgumentParser(description="Grade answer sheets against a question bank")
+    parser.add_argument("bank", help="the question bank the sheets were made from")
+    parser.add_argument("sheets", nargs="?", help="answer sheets, .csv or .jsonl")
+    parser.add_argument("--json", help="write the report as JSON to this file")
+    parser.add_argument("--csv", help="write students.csv and questions.csv into this directory")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="time grading N synthetic students' sheets and exit")
+    args = parser.parse_args(argv)
+    
+    try:
+        bank = load_bank(args.bank)
+    except (OSError, ValueError) as e:
+        print(f"Error loading {args.bank}: {e}", file=sys.stderr)
+        return 1
+    correct, n_choices = answer_key(bank)
+    
+    if args.benchmark:
+        student, question, order, shown = synthetic_sheets(args.benchmark, correct, n_choices)
+        start = time.perf_counter()
+        students, _ = grade(correct, n_choices, student, question, order, shown, args.benchmark)
+        print(f"{args.benchmark} sheets ({len(question)} answers) graded in "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms "
+              f"(mean score {np.nanmean(students['score']):.2f})")
+        return 0
+    if not args.sheets:
+        parser.error("the answer sheets file is required")
+    
+    start = time.perf_counter()
+    try:
+        names, student, question, orders, answers = read_sheets(args.sheets)
+        width = max(int(n_choices.max()) if len(n_choices) else 1, 
+                    max((len(o.strip()) for o in orders), default=0))
+        students, questions = grade(correct, n_choices, student, question, letter_codes(orders, width),
+                                    letter_codes(answers, 1)[:, 0], len(names))
+    except (OSError, ValueError) as e:
+        print(f"Error grading {args.sheets}: {e}", file=sys.stderr)
+        return 1
+    result = report(bank, names, students, questions)
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.csv:
+        write_csv(result, args.csv)
+    if not args.json and not args.csv:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    print(f"{len(names)} sheets ({len(question)} answers) graded in {elapsed:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Per-answer outcome history
+
+Every submitted answer is appended to a binary log of fixed-width records.
+Each record points back to the previous answer to the same question, so the
+small JSON index only needs, per question, the number of its latest record.
+The index also keeps the set of questions whose latest answer was wrong, which
+is all a "review mistakes" session needs; the log itself is never scanned.
+
+merge() folds in the answers of a log kept on another device (see
+quiz_sync.py). Each log is in the order its answers were given, so the two
+are interleaved by timestamp in one pass, answers both logs already share are
+kept once, and the log is rewritten with its back-pointers and index rebuilt.
+
+Several quizzes may share one history. Appends, merges and index writes run
+under a lock on the log, and re-read the index inside it, so back-pointers
+are always taken from the latest index on disk.
+
+When a bank is edited, remap() moves its answers to the questions' new
+indices. Answers to questions that were edited or removed keep their place
+in the log, for the analytics, but under RETIRED, which no question has.
+"""
+import heapq
+import json
+import os
+import struct
+import time
+
+from quiz_io import FileLock, atomic_file, atomic_write_json
+
+# timestamp, question index, bank id, chosen choice (original order, 0 = A),
+# correct?, chosen position on screen, correct position on screen, reserved,
+# record number of the previous answer to the same question (-1 for none)
+RECORD = struct.Struct("<dIHBBBBHi")
+NO_RECORD = -1
+RETIRED = 0xFFFFFFFF  # Question index of answers whose question was edited or removed
+
+
+class AnswerHistory:
+    def __init__(self, log_path="quiz_history.bin", index_path="quiz_history_index.json"):
+        self.log_path = log_path
+        self.index_path = index_path
+        self.index = None
+        self.pending = []  # Answers not written yet, by bank key; ids are given out on flush
+    
+    def load(self):
+        """Read the index once; rebuild it from the log if it is missing or stale"""
+        if self.index is None:
+            with FileLock(self.log_path):
+                self._read_index()
+        return self.index
+    
+    def _read_index(self):
+        """Read the index from disk, rebuilding it if stale; the caller holds the lock"""
+        count = os.path.getsize(self.log_path) // RECORD.size if os.path.exists(self.log_path) else 0
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = None
+        if self.index is None or self.index.get('count') != count:
+            self.rebuild_index()
+    
+    def rebuild_index(self):
+        """Recreate the index with one pass over the log; the caller holds the lock"""
+        self.index = {'count': 0, 'banks': {}, 'latest': {}, 'mistakes': {}}
+        bank_names = {}
+        fingerprints = {}
+        if os.path.exists(self.index_path):
+            # Bank names only live in the index; keep them if it is readable
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    old_index = json.load(f)
+                bank_names = old_index.get('banks', {})
+                fingerprints = old_index.get('fingerprints', {})
+            except (OSError, ValueError, AttributeError):
+                pass
+        self.index['banks'] = bank_names
+        self.index['fingerprints'] = fingerprints
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb') as f:
+                data = f.read()
+            usable = len(data) - len(data) % RECORD.size
+            for rec in RECORD.iter_unpack(data[:usable]):
+                self._index_record(rec)
+        self._write_index()
+    
+    def bank_id(self, bank_key):
+        """Small integer id for a bank key, assigned on first use"""
+        banks = self.load()['banks']
+        if bank_key not in banks:
+            banks[bank_key] = len(banks)
+        return banks[bank_key]
+    
+    def _index_record(self, rec):
+        timestamp, question, bank, chosen, is_correct, shown, correct_shown, _, prev = rec
+        rec_no = self.index['count']
+        self.index['count'] += 1
+        if question == RETIRED:
+            return
+        bank, question = str(bank), str(question)
+        self.index['latest'].setdefault(bank, {})[question] = rec_no
+        # Dict used as an ordered set: question -> record of the wrong answer
+        mistakes = self.index['mistakes'].setdefault(bank, {})
+        if is_correct:
+            mistakes.pop(question, None)
+        else:
+            mistakes[question] = rec_no
+    
+    def record(self, bank_key, question, chosen, is_correct, shown, correct_shown, timestamp=None):
+        """Queue one answer; flush() writes the queued answers"""
+        self.pending.append((bank_key, question, timestamp or time.time(), chosen,
+                             bool(is_correct), shown, correct_shown))
+    
+    def flush(self):
+        """Append queued answers to the log and update the index"""
+        if not self.pending:
+            return
+        with FileLock(self.log_path):
+            self._flush()
+    
+    def _flush(self):
+        # Another quiz may have appended since this one last looked
+        self.index = None
+        self._read_index()
+        records = []
+        for bank_key, question, timestamp, chosen, is_correct, shown, correct_shown in self.pending:
+            records.append(self._link(bank_key, question, timestamp, chosen, is_correct, 
+                                      shown, correct_shown))
+        try:
+            with open(self.log_path, 'ab') as f:
+                f.write(b"".join(records))
+        except OSError as e:
+            print(f"Error saving answer history: {e}")
+            self.index = None  # Indexed answers that never reached the log
+            return
+        self.pending = []
+        self._write_index()
+    
+    def _catch_up(self):
+        """Write queued answers, or re-read the index; the caller holds the lock"""
+        if self.pending:
+            self._flush()
+        else:
+            self.index = None
+        if self.index is None:
+            self._read_index()
+    
+    def _link(self, bank_key, question, timestamp, chosen, is_correct, shown, correct_shown):
+        """Index one answer as the next record, pointing back to the question's latest; returns it packed"""
+        bank = self.bank_id(bank_key)
+        prev = NO_RECORD if question == RETIRED else \
+            self.index['latest'].get(str(bank), {}).get(str(question), NO_RECORD)
+        rec = (timestamp, question, bank, chosen, 1 if is_correct else 0, shown, correct_shown, 0, prev)
+        self._index_record(rec)
+        return RECORD.pack(*rec)
+    
+    def _write_index(self):
+        try:
+            atomic_write_json(self.index_path, self.index)
+        except OSError as e:
+            print(f"Error saving history index: {e}")
+    
+    def events(self):
+        """Every recorded answer in log order, as
+        (bank key, question, timestamp, chosen, correct, shown, correct shown)"""
+        index = self.load()
+        names = {bank: key for key, bank in index['banks'].items()}
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'rb') as f:
+            data = f.read()
+        usable = len(data) - len(data) % RECORD.size
+        for rec in RECORD.iter_unpack(data[:usable]):
+            timestamp, question, bank, chosen, is_correct, shown, correct_shown, _, _ = rec
+            yield (names.get(bank, str(bank)), question, timestamp, chosen, bool(is_correct),
+                   shown, correct_shown)
+    
+    def merge(self, events):
+        """Add answers recorded elsewhere, given in events() form; returns the new ones"""
+        with FileLock(self.log_path):
+            self._catch_up()
+            return self._merge(events)
+    
+    def _merge(self, events):
+        local = list(self.events())
+        # An answer is the same answer on both sides if bank, question, time and choice match
+        known = {event[:4] for event in local}
+        added = []
+        for event in events:
+            event = tuple(event)
+            if event[:4] not in known:
+                known.add(event[:4])
+                added.append(event)
+        if not added:
+            return []
+        
+        records = list(heapq.merge(local, added, key=lambda event: event[2]))
+        self._rewrite(records)
+        return added
+    
+    def remap(self, bank_key, mapping, old_fingerprint=None, new_fingerprint=None):
+        """Move a bank's answers to new question indices after an edit
+
+        mapping[i] is the new index of old question i, or None if it was
+        edited or removed. Given the fingerprints of the bank before and
+        after the edit, a second quiz that reloads the same edit leaves the
+        history alone.
+        """
+        with FileLock(self.log_path):
+            self._catch_up()
+            fingerprints = self.index.setdefault('fingerprints', {})
+            if old_fingerprint is not None and fingerprints.get(bank_key, old_fingerprint) != old_fingerprint:
+                return False
+            records = []
+            for event in self.events():
+                if event[0] == bank_key and event[1] != RETIRED:
+                    new = mapping[event[1]] if event[1] < len(mapping) else None
+                    event = (bank_key, RETIRED if new is None else new) + event[2:]
+                records.append(event)
+            if new_fingerprint is not None:
+                fingerprints[bank_key] = new_fingerprint
+            self._rewrite(records)
+            return True
+    
+    def _rewrite(self, events):
+        """Replace the log with these answers, in events() form, and index them anew"""
+        self.index = {'count': 0, 'banks': self.index['banks'], 
+                      'fingerprints': self.index.get('fingerprints', {}), 'latest': {}, 'mistakes': {}}
+        records = [self._link(*event) for event in events]
+        try:
+            with atomic_file(self.log_path) as f:
+                f.write(b"".join(records))
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError:
+            self.index = None  # Still the old log; read its index again
+            raise
+        self._write_index()
+    
+    def mistakes(self, bank_key):
+        """Question indices in a bank whose most recent answer was wrong"""
+        index = self.load()
+        bank = index['banks'].get(bank_key)
+        if bank is None:
+            return []
+        return [int(q) for q in index['mistakes'].get(str(bank), [])]
+    
+    def answers_for(self, bank_key, question):
+        """All recorded answers to one question, newest first, following the back-pointers"""
+        index = self.load()
+        bank = index['banks'].get(bank_key)
+        if bank is None:
+            return []
+        rec_no = index['latest'].get(str(bank), {}).get(str(question), NO_RECORD)
+        answers = []
+        with open(self.log_path, 'rb') as f:
+            while rec_no != NO_RECORD:
+                f.seek(rec_no * RECORD.size)
+                rec = RECORD.unpack(f.read(RECORD.size))
+                answers.append({'timestamp': rec[0], 'chosen': rec[3], 'correct': bool(rec[4]),
+                                'shown': rec[5], 'correct_shown': rec[6]})
+                rec_no = rec[8]
+        return answers
@@ -0,0 +1,110 @@
+"""Crash-safe JSON files shared between several running quizzes
+
+Files are never overwritten in place: a new version is written to a temp
+file next to it, fsynced and renamed over the old one, so readers and crashes
+only ever see a complete file. Read-modify-write updates run under an
+advisory lock on a separate .lock file (the data file itself is replaced on
+every write, so it cannot carry the lock).
+"""
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Exclusive advisory lock on path + ".lock", used as a context manager"""
+    
+    def __init__(self, path):
+        self.lock_path = path + ".lock"
+        self.file = None
+    
+    def __enter__(self):
+        self.file = open(self.lock_path, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        else:
+            self.file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after 10 s; keep waiting
+        return self
+    
+    def __exit__(self, *exc):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.file.close()
+            self.file = None
+
+
+@contextmanager
+def atomic_file(path, mode='wb'):
+    """A new file that replaces path when the with block ends without an error
+
+    Every writer gets a temp file of its own, so two processes writing the
+    same path at once both succeed and the last rename wins.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path, data, indent=None):
+    """Replace path with data as JSON, all or nothing"""
+    directory = os.path.dirname(os.path.abspath(path))
+    with atomic_file(path, 'w') as f:
+        # dumps, not dump: only the one-shot encoder is the fast C one
+        f.write(json.dumps(data, indent=indent, separators=None if indent else (',', ':')))
+        f.flush()
+        os.fsync(f.fileno())
+    if os.name == "posix":
+        # Make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def load_json(path):
+    """Contents of a JSON file, {} if it does not exist
+
+    Raises ValueError if the file is there but cannot be parsed.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def set_aside(path):
+    """Move an unreadable file out of the way instead of overwriting it"""
+    corrupt_path = f"{path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+    os.replace(path, corrupt_path)
+    print(f"Unreadable {path} kept as {corrupt_path}")
+    return corrupt_path
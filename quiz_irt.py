@@ -0,0 +1,148 @@
+"""Item-response-theory difficulty calibration (requires NumPy)
+
+    python quiz_irt.py [--model 2pl] [--profile quiz_history.bin ...] [--banks questionbank*.txt]
+
+Each answer-history log is one profile (learner) with its own ability. The
+1PL/2PL model P(correct) = sigmoid(a_j * (theta_p - b_j)) is fitted to every
+recorded answer by full-batch gradient ascent with weak Gaussian priors, and
+each question's difficulty b_j is written into the bank cache, where the quiz
+reads it for free when the bank is loaded.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from quiz_analytics import load_bank_names, load_history
+from quiz_history import RETIRED
+
+
+def collect_answers(profiles):
+    """Stack the answers of several profiles
+
+    profiles is a list of (log path, index path). Returns (person, item,
+    correct, items) where items[i] is the (bank key, question) of item i.
+    """
+    persons, keys, outcomes = [], [], []
+    item_ids = {}
+    for p, (log_path, index_path) in enumerate(profiles):
+        history = load_history(log_path)
+        # Answers to questions since edited or removed belong to no question now
+        history = history[history['question'] != RETIRED]
+        if not len(history):
+            continue
+        names = load_bank_names(index_path)
+        # Item key = (bank key, question), mapped to a dense id across profiles
+        pairs = np.stack([history['bank'].astype(np.int64), history['question'].astype(np.int64)], axis=1)
+        unique_pairs, inverse = np.unique(pairs, axis=0, return_inverse=True)
+        local_ids = np.empty(len(unique_pairs), dtype=np.int64)
+        for j, (bank, question) in enumerate(unique_pairs):
+            key = (names.get(int(bank), f"#{bank}"), int(question))
+            local_ids[j] = item_ids.setdefault(key, len(item_ids))
+        persons.append(np.full(len(history), p, dtype=np.int64))
+        keys.append(local_ids[inverse.reshape(-1)])
+        outcomes.append(history['correct'].astype(np.float64))
+    if not persons:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0), []
+    items = [None] * len(item_ids)
+    for key, i in item_ids.items():
+        items[i] = key
+    return np.concatenate(persons), np.concatenate(keys), np.concatenate(outcomes), items
+
+
+def fit(person, item, correct, n_persons, n_items, model="2pl",
+        iterations=500, learning_rate=0.5, prior=0.1):
+    """Fit theta (per person), b and a (per item) by gradient ascent
+
+    prior is the weight of the N(0, 1) priors on theta and b and of the
+    N(0, 1) prior on log a; it keeps items answered by only one profile, or
+    always right/wrong, at finite values.
+    """
+    theta = np.zeros(n_persons)
+    b = np.zeros(n_items)
+    log_a = np.zeros(n_items)
+    n = max(len(correct), 1)
+    person_counts = np.maximum(np.bincount(person, minlength=n_persons), 1)
+    item_counts = np.maximum(np.bincount(item, minlength=n_items), 1)
+    
+    for _ in range(iterations):
+        a = np.exp(log_a)
+        z = a[item] * (theta[person] - b[item])
+        p = 1.0 / (1.0 + np.exp(-z))
+        residual = correct - p  # d loglik / dz
+        
+        grad_theta = np.bincount(person, weights=residual * a[item], minlength=n_persons) - prior * theta
+        grad_b = -np.bincount(item, weights=residual * a[item], minlength=n_items) - prior * b
+        theta += learning_rate * grad_theta / person_counts
+        b += learning_rate * grad_b / item_counts
+        if model == "2pl":
+            grad_log_a = np.bincount(item, weights=residual * z, minlength=n_items) - prior * log_a
+            log_a += learning_rate * grad_log_a / item_counts
+    
+    # Anchor the scale: average person ability is 0
+    shift = theta.mean() if n_persons else 0.0
+    theta -= shift
+    b -= shift
+    loglik = float(np.sum(correct * np.log(p + 1e-12) + (1 - correct) * np.log(1 - p + 1e-12)) / n) \
+        if len(correct) else 0.0
+    return theta, b, np.exp(log_a), loglik
+
+
+def find_profiles(paths):
+    """(log, index) pairs; a log's index sits next to it with the usual name"""
+    profiles = []
+    for log_path in paths:
+        base = log_path[:-len(".bin")] if log_path.endswith(".bin") else log_path
+        profiles.append((log_path, base + "_index.json"))
+    return profiles
+
+
+def main(argv=None):
+    from quiz_bank import load_bank, set_bank_difficulty
+    
+    parser = argparse.ArgumentParser(description="Calibrate question difficulty from answer history")
+    parser.add_argument("--profile", nargs="+", default=["quiz_history.bin"],
+                        help="history logs, one per learner (default: quiz_history.bin)")
+    parser.add_argument("--banks", nargs="*", default=None,
+                        help="banks to write difficulties for (default: *.txt, *.jqb and *.jqz here)")
+    parser.add_argument("--model", choices=("1pl", "2pl"), default="2pl")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args(argv)
+    
+    start = time.perf_counter()
+    profiles = find_profiles(args.profile)
+    person, item, correct, items = collect_answers(profiles)
+    if not items:
+        print("No answers recorded yet", file=sys.stderr)
+        return 1
+    theta, b, a, loglik = fit(person, item, correct, len(profiles), len(items),
+                              model=args.model, iterations=args.iterations)
+    print(f"{args.model.upper()} fit: {len(correct)} answers, {len(items)} questions, "
+          f"{len(profiles)} profile(s), mean log-likelihood {loglik:.3f}, "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    for (log_path, _), ability in zip(profiles, theta):
+        print(f"  ability {ability:+.2f}  {log_path}")
+    
+    difficulty = {}
+    for i, key in enumerate(items):
+        difficulty[key] = round(float(b[i]), 3)
+    
+    bank_paths = args.banks
+    if bank_paths is None:
+        bank_paths = [f for f in os.listdir(".") if f.endswith((".txt", ".jqb", ".jqz"))]
+    for path in bank_paths:
+        bank_key = os.path.basename(path)
+        count = len(load_bank(path))
+        values = [difficulty.get((bank_key, q)) for q in range(count)]
+        calibrated = sum(v is not None for v in values)
+        if calibrated:
+            set_bank_difficulty(path, values)
+            print(f"  {bank_key}: {calibrated}/{count} questions calibrated")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Leak checks for long sessions
+
+    python quiz_leaks.py questionbankjp02.txt [--batches 300]
+
+LeakMonitor samples what a long session could pile up, after every screen
+change:
+
+    widgets    live Tk widgets under the root window
+    variables  Tcl variables (each IntVar and StringVar is one)
+    commands   Tcl commands backed by Python callbacks (command=, bind(),
+               bind_all(), trace_add() and after() each create one)
+    bindings   event bindings on the "all" tag and on the root window
+    timers     pending after() callbacks
+    python     bytes allocated by Python, from tracemalloc
+
+Screens differ in size, so each screen is compared with itself: a count that
+is higher on the last visits to a screen than on any of the first visits
+after warm-up is reported as growing. Full tracemalloc snapshots are only
+taken at the end of warm-up and at the report, where the source lines that
+grew most are listed.
+
+The command above drives QuizApp through a simulated session of that many
+pages (answer, results, next page, and a new session at the end of the
+bank) in a scratch directory, and exits with status 1 if anything grows;
+jpquiz04.py --leak-check samples a real session and writes the report to
+quiz_leaks.log on exit.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+COUNTS = ("widgets", "variables", "commands", "bindings", "timers")
+PYTHON_TOLERANCE = 256 * 1024  # Bytes of growth allowed for caches and free lists
+
+
+class LeakMonitor:
+    def __init__(self, root, warmup=20, window=10):
+        self.root = root
+        self.warmup = warmup  # Samples ignored while caches fill up
+        self.window = window  # Visits per screen compared at each end
+        self.samples = []  # (screen, {metric: value})
+        self.baseline = None  # tracemalloc snapshot at the end of warm-up
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+    
+    def wrap(self, name, func):
+        """Return func sampling the screen it has drawn, named name"""
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.sample(name)
+        wrapper.__name__ = getattr(func, '__name__', name)
+        wrapper.__doc__ = getattr(func, '__doc__', None)
+        return wrapper
+    
+    def _tcl_list(self, *command):
+        try:
+            return self.root.tk.splitlist(self.root.tk.call(*command))
+        except Exception:
+            return ()
+    
+    def count_widgets(self, widget):
+        children = widget.winfo_children()
+        return len(children) + sum(self.count_widgets(child) for child in children)
+    
+    def sample(self, screen):
+        """Record the counts as they are with screen on show"""
+        gc.collect()  # Only what is really still referenced
+        counts = {
+            'widgets': self.count_widgets(self.root),
+            'variables': len(self._tcl_list('info', 'globals')),
+            # tkinter names a callback's command after id() and the function
+            'commands': sum(name[:1].isdigit() for name in self._tcl_list('info', 'commands')),
+            'bindings': len(self._tcl_list('bind', 'all')) + len(self._tcl_list('bind', '.')),
+            'timers': len(self._tcl_list('after', 'info')),
+            'python': tracemalloc.get_traced_memory()[0],
+        }
+        self.samples.append((screen, counts))
+        if len(self.samples) == self.warmup:
+            self.baseline = tracemalloc.take_snapshot()
+    
+    def growth(self):
+        """{(screen, metric): (first, last)} for everything that kept growing"""
+        visits = {}
+        for screen, counts in self.samples[self.warmup:]:
+            visits.setdefault(screen, []).append(counts)
+        grown = {}
+        for screen, seen in visits.items():
+            if len(seen) < 2 * self.window:
+                continue  # Too few visits to tell growth from noise
+            first, last = seen[:self.window], seen[-self.window:]
+            for metric in COUNTS + ("python",):
+                before = max(c[metric] for c in first)
+                after = min(c[metric] for c in last)
+                allowed = PYTHON_TOLERANCE if metric == "python" else 0
+                if after > before + allowed:
+                    grown[screen, metric] = (before, after)
+        return grown
+    
+    def report(self, top=10):
+        """Text report: screens seen, what grew and the lines that allocated it"""
+        if not self.samples:
+            return "Leak check: no screens sampled"
+        last = self.samples[-1][1]
+        lines = [f"Leak check: {len(self.samples)} screens, now "
+                 + ", ".join(f"{metric} {last[metric]}" for metric in COUNTS)
+                 + f", python {last['python'] / 1024:.0f} KiB"]
+        grown = self.growth()
+        if not grown:
+            lines.append("  nothing grew after warm-up")
+        for (screen, metric), (before, after) in sorted(grown.items()):
+            lines.append(f"  GROWING {metric} on {screen}: {before} -> {after}")
+        if self.baseline is not None:
+            own = tracemalloc.Filter(False, __file__)  # The samples themselves
+            stats = tracemalloc.take_snapshot().filter_traces([own]).compare_to(
+                self.baseline.filter_traces([own]), 'lineno')
+            lines.append("  top Python growth since warm-up:")
+            for stat in stats[:top]:
+                lines.append(f"    {stat}")
+        return "\n".join(lines)
+    
+    def dump(self, log_path=None):
+        """Write the report to stderr, or append it to log_path"""
+        text = self.report()
+        if log_path:
+            try:
+                with open(log_path, 'a', encoding='utf-8') as f:
+                    f.write(text + "\n")
+                return
+            except OSError as e:
+                print(f"Error writing leak check log: {e}", file=sys.stderr)
+        print(text, file=sys.stderr)
+
+
+def simulate(bank_paths, batches, batch_size=10):
+    """Run QuizApp through batches pages in a scratch directory; returns its monitor"""
+    import tkinter as tk
+    from jpquiz04 import QuizApp
+    
+    bank_paths = [os.path.abspath(p) for p in bank_paths]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        # Progress, history and snapshots of the simulation stay out of the real ones
+        os.chdir(scratch)
+        try:
+            root = tk.Tk()
+            root.withdraw()
+            app = QuizApp(root, batch_size=batch_size, seed=0, mode="batch", bank_dir=scratch)
+            monitor = app.enable_leak_check()
+            app.start_session(bank_paths, quiet=True)
+            for page in range(batches):
+                for i, var in enumerate(app.answer_vars):
+                    var.set((page + i) % 2)
+                app.show_answers(app.page_start, app.page_end)
+                root.update()
+                if app.page_end < app.session_total:
+                    app.next_batch()
+                else:
+                    app.show_final_results()
+                    root.update()
+                    app.start_session(bank_paths, quiet=True)
+                root.update()
+            app.snapshots.flush()
+            root.destroy()
+        finally:
+            os.chdir(cwd)
+    return monitor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a long simulated quiz session for leaks")
+    parser.add_argument("banks", nargs="+", help="question bank files")
+    parser.add_argument("--batches", type=int, default=300, help="pages to go through (default: 300)")
+    parser.add_argument("--batch-size", type=int, default=10, help="questions per page (default: 10)")
+    args = parser.parse_args(argv)
+    
+    monitor = simulate(args.banks, args.batches, args.batch_size)
+    print(monitor.report())
+    return 1 if monitor.growth() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
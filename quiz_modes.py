@@ -0,0 +1,42 @@
+"""Quiz modes: which questions a session draws, in what order, how many per page
+
+    single            one question per page, every question in the banks
+    batch             pages of --batch-size questions, every question
+    unanswered-first  questions not answered yet first, then the answered ones
+    unanswered-only   only questions not answered yet (the default)
+
+A mode is only a policy over the banks, progress and statistics a session
+already has loaded, so switching mode mid-session needs no re-reading: the
+questions not yet drawn are simply ordered again by the new mode.
+"""
+
+
+class QuizMode:
+    def __init__(self, name, label, page_size=None, answered=None):
+        self.name = name
+        self.label = label
+        self.page_size = page_size  # None: the session's --batch-size
+        # What happens to answered questions: None leaves them out,
+        # "last" puts them after the unanswered ones, "mixed" shuffles them in
+        self.answered = answered
+    
+    def tiers(self, pool, answered):
+        """pool split into lists drawn one after another, each shuffled on its own"""
+        if self.answered == "mixed":
+            return [list(pool)]
+        unanswered = [i for i in pool if i not in answered]
+        if self.answered == "last":
+            return [unanswered, [i for i in pool if i in answered]]
+        return [unanswered]
+    
+    def batch_size(self, default):
+        return self.page_size or default
+
+
+MODES = {mode.name: mode for mode in (
+    QuizMode("single", "One at a time", page_size=1, answered="mixed"),
+    QuizMode("batch", "All questions", answered="mixed"),
+    QuizMode("unanswered-first", "Unanswered first", answered="last"),
+    QuizMode("unanswered-only", "Unanswered only"),
+)}
+DEFAULT_MODE = "unanswered-only"
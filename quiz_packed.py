@@ -0,0 +1,133 @@
+"""Block-compressed bank format (.jqz) for large bank archives
+
+Layout, all integers little-endian:
+
+    header      HEADER struct (magic, version, counts, section offsets)
+    dictionary  zlib-compressed preset dictionary shared by all blocks
+    flags       zlib-compressed, one byte per question (1 = playable)
+    block index (block_count + 1) u32 offsets of the compressed blocks
+    blocks      block_size questions each, every block a zlib-compressed
+                .jqb bank of its own
+
+Blocks are compressed independently, so reading a question decompresses
+only its block; the few blocks a batch touches are kept decoded in a small
+LRU. Small blocks compress poorly on their own, so they all start from a
+preset dictionary sampled across the bank, which holds the markup and
+phrasing that repeat from block to block. Each block is a complete .jqb
+bank, so its questions are read by BinaryBank exactly as a .jqb file's are.
+"""
+import struct
+import zlib
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from quiz_binary import BinaryBank, encode_bank, map_file
+
+MAGIC = b"JQZ1"
+VERSION = 1
+BLOCK_SIZE = 32  # Questions per block
+CACHED_BLOCKS = 16  # Decoded blocks kept per bank
+DICTIONARY_SIZE = 32768  # zlib's window; a larger dictionary is not used
+
+# magic, version, reserved, questions, block size, block count, flags offset, index offset
+HEADER = struct.Struct("<4sHHIIIII")
+
+
+def encode_packed(questions, block_size=BLOCK_SIZE, level=9):
+    """Serialize parsed question dicts to .jqz bytes"""
+    from quiz_bank import is_playable
+    
+    raw_blocks = [encode_bank(questions[start:start + block_size])
+                  for start in range(0, len(questions), block_size)]
+    # The tail of every step-th block: records and the end of the strings
+    step = max(1, len(raw_blocks) // 16)
+    sample = DICTIONARY_SIZE // len(raw_blocks[::step]) if raw_blocks else 0
+    dictionary = b"".join(raw[-sample:] for raw in raw_blocks[::step])[-DICTIONARY_SIZE:]
+    blocks = []
+    for raw in raw_blocks:
+        compressor = zlib.compressobj(level, zdict=dictionary)
+        blocks.append(compressor.compress(raw) + compressor.flush())
+    flags = zlib.compress(bytes(is_playable(q) for q in questions), level)
+    
+    packed_dictionary = zlib.compress(dictionary, level)
+    flags_offset = HEADER.size + len(packed_dictionary)
+    index_offset = flags_offset + len(flags)
+    offsets = [index_offset + 4 * (len(blocks) + 1)]
+    for block in blocks:
+        offsets.append(offsets[-1] + len(block))
+    header = HEADER.pack(MAGIC, VERSION, 0, len(questions), block_size, len(blocks),
+                         flags_offset, index_offset)
+    index = struct.pack(f"<{len(offsets)}I", *offsets)
+    return b"".join([header, packed_dictionary, flags, index] + blocks)
+
+
+def write_packed_bank(questions, out_path, block_size=BLOCK_SIZE):
+    """Write questions to a .jqz file"""
+    with open(out_path, 'wb') as f:
+        f.write(encode_packed(questions, block_size))
+
+
+class PackedBank(Sequence):
+    """Read-only question sequence backed by a .jqz buffer
+
+    Items are the same dicts BinaryBank returns; explanation() reads one
+    question's explanation.
+    """
+    
+    def __init__(self, buffer):
+        self.buf = memoryview(buffer)
+        (magic, version, _, self.count, self.block_size, self.block_count,
+         flags_offset, index_offset) = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a .jqz question bank")
+        if version != VERSION:
+            raise ValueError(f"unsupported .jqz version {version}")
+        self.dictionary = zlib.decompress(self.buf[HEADER.size:flags_offset])
+        self.flags_range = (flags_offset, index_offset)
+        self.offsets = self.buf[index_offset:index_offset + 4 * (self.block_count + 1)].cast('I')
+        self.blocks = OrderedDict()  # block number -> BinaryBank, least recently used first
+    
+    @classmethod
+    def open(cls, file_path):
+        """Map a .jqz file; blocks are read from disk as they are needed"""
+        return cls(map_file(file_path))
+    
+    def block(self, number):
+        """One decompressed block, from the LRU if it was used recently"""
+        bank = self.blocks.get(number)
+        if bank is not None:
+            self.blocks.move_to_end(number)
+            return bank
+        decompressor = zlib.decompressobj(zdict=self.dictionary)
+        data = decompressor.decompress(self.buf[self.offsets[number]:self.offsets[number + 1]])
+        bank = self.blocks[number] = BinaryBank(data)
+        if len(self.blocks) > CACHED_BLOCKS:
+            self.blocks.popitem(last=False)
+        return bank
+    
+    def locate(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("question index out of range")
+        number, offset = divmod(index, self.block_size)
+        return self.block(number), offset
+    
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        bank, offset = self.locate(index)
+        return bank[offset]
+    
+    def explanation(self, index):
+        bank, offset = self.locate(index)
+        return bank.explanation(offset)
+    
+    def playable_indices(self):
+        """Indices of questions with a correct answer, without opening any block"""
+        start, end = self.flags_range
+        flags = zlib.decompress(self.buf[start:end])
+        return [i for i, playable in enumerate(flags) if playable]
@@ -0,0 +1,175 @@
+"""Progress store: one small shard file per bank, plus a manifest
+
+    quiz_progress/
+        manifest.json                      bank key -> shard, answered, total
+        questionbank.txt.3f9a0c1d2e.json   {"answered": [...], "stats": {...}}
+
+Shards are named after the bank key (the file name progress has always been
+keyed by) and a hash of it, so saving one bank rewrites only its own shard and
+its manifest row, however many banks there are. The manifest is enough to
+list every bank's completion without opening a shard.
+
+Each file is parsed once; later reads only stat it and re-parse when another
+process has replaced it. Changes are queued per bank and applied in save(),
+under the file's lock, to the latest data on disk, so nothing another window
+saved in the meantime is lost. A change stays queued until its shard is
+written, so a save that fails is retried by the next one. A single
+quiz_progress.json from older versions is split into shards the first time
+the store is opened.
+"""
+import hashlib
+import os
+import re
+
+from quiz_io import FileLock, atomic_write_json, load_json, set_aside
+
+MANIFEST = "manifest.json"
+
+
+def shard_name(file_key):
+    safe = re.sub(r"[^\w.-]", "_", file_key)[:60]
+    digest = hashlib.sha1(file_key.encode('utf-8')).hexdigest()[:10]
+    return f"{safe}.{digest}.json"
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    # A replaced file has a new inode even if size and mtime look the same
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class _CachedJSON:
+    """One JSON file and the stat its parsed data matches"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.data = {}
+        self.signature = None
+    
+    def refresh(self, locked=False):
+        signature = _stat(self.path)
+        if signature is not None and signature == self.signature:
+            return self.data
+        try:
+            self.data = load_json(self.path) if signature is not None else {}
+        except ValueError as e:
+            # Written atomically, so only a hand-edited file gets here
+            print(f"Error reading {self.path}: {e}")
+            if locked:
+                set_aside(self.path)
+                signature = None
+            self.data = {}
+        self.signature = signature
+        return self.data
+    
+    def write(self):
+        try:
+            atomic_write_json(self.path, self.data, indent=2)
+        except OSError:
+            self.signature = None  # The next read starts again from the file
+            raise
+        self.signature = _stat(self.path)
+
+
+class ProgressStore:
+    def __init__(self, directory="quiz_progress", legacy_path="quiz_progress.json"):
+        self.directory = directory
+        self.legacy_path = legacy_path
+        self.manifest = _CachedJSON(os.path.join(directory, MANIFEST))
+        self.shards = {}  # file key -> _CachedJSON
+        self.pending = []  # (file key, update, name) not saved yet
+        self.unlisted = set()  # Banks whose shard is saved but not their manifest row
+        self.migrated = False
+    
+    def exists(self):
+        """Whether any progress has been saved"""
+        return os.path.exists(self.manifest.path) or os.path.exists(self.legacy_path)
+    
+    def _migrate(self):
+        """Split an old single-file quiz_progress.json into shards, once"""
+        if self.migrated:
+            return
+        self.migrated = True
+        if not os.path.exists(self.legacy_path):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with FileLock(self.manifest.path):
+            if not os.path.exists(self.legacy_path):
+                return  # Another window got here first
+            try:
+                legacy = load_json(self.legacy_path)
+            except ValueError:
+                set_aside(self.legacy_path)
+                return
+            manifest = self.manifest.refresh(locked=True)
+            for file_key, entry in legacy.items():
+                shard = self._shard(file_key)
+                shard.data = entry
+                shard.write()
+                manifest[file_key] = self._manifest_row(file_key, entry)
+            self.manifest.write()
+            os.replace(self.legacy_path, self.legacy_path + ".migrated")
+    
+    def _shard(self, file_key):
+        if file_key not in self.shards:
+            self.shards[file_key] = _CachedJSON(os.path.join(self.directory, shard_name(file_key)))
+        return self.shards[file_key]
+    
+    @staticmethod
+    def _manifest_row(file_key, entry):
+        return {'shard': shard_name(file_key), 'answered': len(entry.get('answered', [])),
+                'total_questions': entry.get('total_questions', 0)}
+    
+    def get(self, file_key):
+        """One bank's progress; its shard is re-read only if it changed on disk"""
+        self._migrate()
+        return self._shard(file_key).refresh()
+    
+    def summary(self):
+        """{bank key: {'answered', 'total_questions', 'shard'}} from the manifest alone"""
+        self._migrate()
+        return self.manifest.refresh()
+    
+    def change(self, file_key, update, name=None):
+        """Queue update(entry) for one bank's entry; save() applies it
+
+        A named change replaces one of the same name still queued for the
+        bank, e.g. a save whose write failed, which the new one covers.
+        """
+        if name is not None:
+            self.pending = [change for change in self.pending if change[0] != file_key or change[2] != name]
+        self.pending.append((file_key, update, name))
+    
+    def is_pending(self, file_key):
+        """Whether a change to a bank is still queued"""
+        return any(change[0] == file_key for change in self.pending)
+    
+    def save(self):
+        """Apply the queued changes to the latest shards and write only those
+
+        On an error, whatever was not written stays queued for the next save.
+        """
+        if not self.pending and not self.unlisted:
+            return
+        self._migrate()
+        os.makedirs(self.directory, exist_ok=True)
+        for file_key in dict.fromkeys(file_key for file_key, _, _ in self.pending):
+            shard = self._shard(file_key)
+            with FileLock(shard.path):
+                entry = shard.refresh(locked=True)
+                entry.setdefault('answered', [])
+                for key, update, _ in self.pending:
+                    if key == file_key:
+                        update(entry)
+                shard.write()
+            self.pending = [change for change in self.pending if change[0] != file_key]
+            self.unlisted.add(file_key)
+        with FileLock(self.manifest.path):
+            manifest = self.manifest.refresh(locked=True)
+            for file_key in self.unlisted:
+                manifest[file_key] = self._manifest_row(file_key, self._shard(file_key).data)
+            self.manifest.write()
+        self.unlisted = set()
@@ -0,0 +1,106 @@
+"""Full-text search over questions, choices and explanations
+
+Text is NFKC-normalized (full/half-width folding), and wave-dash variants
+and katakana/hiragana are unified, then every character bigram and trigram
+is indexed. A query is answered by intersecting the posting lists of its
+n-grams and confirming the few candidates with a substring check.
+"""
+import os
+import pickle
+import unicodedata
+
+from quiz_bank import CACHE_DIR, bank_explanations, bank_fingerprint, cache_path
+from quiz_io import atomic_file
+
+INDEX_VERSION = 2
+FIELDS = ("question", "choices", "explanation")
+
+# NFKC turns ～ into ~ but leaves these look-alikes alone; katakana is
+# folded to hiragana so ｲｶﾝ, イカン and いかん all match
+FOLD = str.maketrans({"〜": "~", "∼": "~", "〰": "~",
+                      **{chr(k): chr(k - 0x60) for k in range(0x30A1, 0x30F7)}})
+
+_memory_cache = {}  # abspath -> (fingerprint, SearchIndex)
+
+
+def normalize(text):
+    """Fold width, compatibility forms, wave dashes, kana and case"""
+    if not text:
+        return ""
+    return unicodedata.normalize("NFKC", text).translate(FOLD).casefold()
+
+
+def ngrams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """Character bigram/trigram inverted index over one bank"""
+    
+    def __init__(self, questions, explanations):
+        self.texts = []  # per question: normalized text of each field
+        self.postings = {}  # n-gram -> set of question indices
+        for idx, (q, explanation) in enumerate(zip(questions, explanations)):
+            fields = (normalize(q["question"]),
+                      "\n".join(normalize(c) for c in q["choices"]),
+                      normalize(explanation))
+            self.texts.append(fields)
+            joined = "\n".join(fields)
+            for gram in ngrams(joined, 2) | ngrams(joined, 3):
+                self.postings.setdefault(gram, set()).add(idx)
+    
+    def search(self, query):
+        """Return [(question index, [matched field names]), ...] in bank order"""
+        needle = normalize(query).strip()
+        if not needle:
+            return []
+        if len(needle) == 1:
+            candidates = range(len(self.texts))
+        else:
+            n = 3 if len(needle) >= 3 else 2
+            grams = sorted((self.postings.get(g, ()) for g in ngrams(needle, n)), key=len)
+            if not grams[0]:
+                return []
+            candidates = set(grams[0]).intersection(*grams[1:])
+        
+        results = []
+        for idx in sorted(candidates):
+            matched = [name for name, text in zip(FIELDS, self.texts[idx]) if needle in text]
+            if matched:
+                results.append((idx, matched))
+        return results
+
+
+def _index_cache_path(file_path):
+    return cache_path(file_path) + ".search"
+
+
+def get_search_index(file_path, questions):
+    """Search index for a loaded bank, built once and cached in memory and on disk"""
+    abspath = os.path.abspath(file_path)
+    fingerprint = bank_fingerprint(abspath)
+    cached = _memory_cache.get(abspath)
+    if cached and cached[0] == fingerprint:
+        return cached[1]
+    
+    index = None
+    try:
+        with open(_index_cache_path(abspath), 'rb') as f:
+            entry = pickle.load(f)
+        if entry.get('version') == INDEX_VERSION and entry.get('fingerprint') == fingerprint:
+            index = entry['index']
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+    
+    if index is None:
+        index = SearchIndex(questions, bank_explanations(abspath, range(len(questions))))
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with atomic_file(_index_cache_path(abspath)) as f:
+                pickle.dump({'version': INDEX_VERSION, 'fingerprint': fingerprint, 'index': index},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"Error writing search index: {e}")
+    
+    _memory_cache[abspath] = (fingerprint, index)
+    return index
@@ -0,0 +1,87 @@
+"""Snapshot of an unfinished quiz session, for an exact resume
+
+The snapshot holds just enough engine state to rebuild the current screen
+without re-parsing the banks or re-shuffling anything: the questions drawn
+so far as (original index, choice order) pairs, the answers, the selections
+made on the open page, the sampler's position and the random generator's
+state, so the pages after it are drawn as they would have been. Writes are
+debounced, so a burst of clicks costs one write, and atomic, so a crash
+leaves either the old snapshot or the new one.
+"""
+import json
+import os
+
+from quiz_io import atomic_write_json
+
+SNAPSHOT_VERSION = 3
+
+
+def encode_runs(indices):
+    """[3, 4, 5, 9] -> [[3, 6], [9, 10]]; unanswered indices are mostly runs"""
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1])
+    return runs
+
+
+def decode_runs(runs):
+    return [i for start, end in runs for i in range(start, end)]
+
+
+def load_snapshot(path):
+    """The saved snapshot, or None if there is none (or it is unreadable)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+class SnapshotWriter:
+    """Debounced writer: schedule() may be called on every change"""
+    
+    def __init__(self, root, path="quiz_session.json", delay_ms=300):
+        self.root = root
+        self.path = path
+        self.delay_ms = delay_ms
+        self.build = None  # Returns the snapshot dict at write time
+        self.pending = None  # after() id of the scheduled write
+    
+    def schedule(self, build):
+        """Write build() in delay_ms, folding in any changes made until then"""
+        self.build = build
+        if self.pending is None:
+            self.pending = self.root.after(self.delay_ms, self.flush)
+    
+    def flush(self):
+        """Write now if a write is scheduled"""
+        if self.pending is not None:
+            try:
+                self.root.after_cancel(self.pending)
+            except Exception:
+                pass  # Already fired, or the window is gone
+            self.pending = None
+        if self.build is None:
+            return
+        build, self.build = self.build, None
+        try:
+            atomic_write_json(self.path, build())
+        except (OSError, ValueError) as e:
+            print(f"Error saving session snapshot: {e}")
+    
+    def clear(self):
+        """Drop any scheduled write and the snapshot itself"""
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        self.build = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,92 @@
+"""Running per-grammar-point and per-bank statistics
+
+Counters are updated in O(1) per answer and stored in the progress file under
+each bank's "stats" key, so the stats screen never recomputes from history.
+"""
+import heapq
+import time
+
+ROLLING_WINDOW = 20  # Answers kept per counter for the rolling accuracy
+
+
+def new_counter():
+    return {'attempts': 0, 'correct': 0, 'recent': "", 'last_seen': None}
+
+
+def update_counter(counter, is_correct, timestamp):
+    counter['attempts'] += 1
+    if is_correct:
+        counter['correct'] += 1
+    # Outcomes as a short "1"/"0" string, newest last, capped at the window
+    counter['recent'] = (counter['recent'] + ("1" if is_correct else "0"))[-ROLLING_WINDOW:]
+    # Answers merged in from another device can be older than the last one seen
+    counter['last_seen'] = max(timestamp, counter['last_seen'] or timestamp)
+
+
+def accuracy(counter):
+    return counter['correct'] / counter['attempts'] if counter['attempts'] else 0.0
+
+
+def rolling_accuracy(counter):
+    recent = counter['recent']
+    return recent.count("1") / len(recent) if recent else 0.0
+
+
+class StatsAggregator:
+    """Counters for one bank: the bank as a whole and each grammar point in it"""
+    
+    def __init__(self, data=None):
+        data = data or {}
+        # Own copies, so counting never changes the dicts they were loaded from
+        self.bank = dict(data['bank']) if data.get('bank') else new_counter()
+        self.grammar = {point: dict(counter) for point, counter in (data.get('grammar') or {}).items()}
+        self.unsaved = []  # Answers counted since the counters were loaded
+    
+    def update(self, grammar_point, is_correct, timestamp=None):
+        """Count one answer"""
+        timestamp = timestamp or time.time()
+        self.unsaved.append((grammar_point, is_correct, timestamp))
+        self._count(grammar_point, is_correct, timestamp)
+    
+    def _count(self, grammar_point, is_correct, timestamp):
+        update_counter(self.bank, is_correct, timestamp)
+        if grammar_point:
+            if grammar_point not in self.grammar:
+                self.grammar[grammar_point] = new_counter()
+            update_counter(self.grammar[grammar_point], is_correct, timestamp)
+    
+    def to_dict(self):
+        return {'bank': dict(self.bank), 
+                'grammar': {point: dict(counter) for point, counter in self.grammar.items()}}
+    
+    def rebase(self, data):
+        """Counters as saved by someone else, plus this aggregator's unsaved answers"""
+        merged = StatsAggregator(data)
+        for answer in self.unsaved:
+            merged._count(*answer)
+        return merged
+
+
+def weakest_points(aggregators, limit=20):
+    """The limit grammar points with the lowest rolling accuracy across banks
+
+    Returns (grammar point, counter) pairs; a point found in several banks
+    is reported with its counters combined.
+    """
+    combined = {}
+    for agg in aggregators:
+        for point, counter in agg.grammar.items():
+            if point not in combined:
+                combined[point] = dict(counter)
+                continue
+            total = combined[point]
+            total['attempts'] += counter['attempts']
+            total['correct'] += counter['correct']
+            if (counter['last_seen'] or 0) > (total['last_seen'] or 0):
+                total['last_seen'] = counter['last_seen']
+                total['recent'] = (total['recent'] + counter['recent'])[-ROLLING_WINDOW:]
+            else:
+                total['recent'] = (counter['recent'] + total['recent'])[-ROLLING_WINDOW:]
+    return heapq.nsmallest(limit, combined.items(),
+                           key=lambda item: (rolling_accuracy(item[1]), accuracy(item[1]),
+                                             -item[1]['attempts']))
@@ -0,0 +1,146 @@
+"""Carry progress between devices without either side overwriting the other
+
+    python quiz_sync.py export laptop.json        (on the laptop)
+    python quiz_sync.py import laptop.json        (on the desktop, and the other way round)
+
+An export holds every bank's answered questions and the whole answer history,
+one event per answer. Importing merges it into the local progress instead of
+replacing it:
+
+    answered  the union of both sides' answered questions
+    history   both logs interleaved by time; an answer both sides already
+              have (from an earlier sync) is kept once
+    stats     the running counters also count the answers new to this side
+
+Both merges only ever add, so importing the same file twice, or syncing in
+either direction first, ends up the same, and nothing answered on either
+device is lost. Progress reset on one device comes back from a device that
+still has it, as a union must. The merge is one pass over each log and one
+set of the answers already known.
+
+Answered questions and history events are question indices, so a bank whose
+file differs between the devices (its fingerprint in the export is not the
+local one) is left out of the merge and reported, rather than merged onto
+the wrong questions. Sync again once both have the same version of it.
+"""
+import argparse
+import os
+import sys
+import time
+
+from quiz_history import AnswerHistory
+from quiz_io import atomic_write_json, load_json
+from quiz_progress import ProgressStore
+
+EXPORT_VERSION = 1
+
+
+def export_progress(out_path, store=None, history=None):
+    """Write every bank's progress and the answer history to out_path"""
+    store = store or ProgressStore()
+    history = history or AnswerHistory()
+    progress = {}
+    for file_key in store.summary():
+        entry = store.get(file_key)
+        progress[file_key] = {'answered': entry.get('answered', []),
+                              'total_questions': entry.get('total_questions', 0),
+                              'fingerprint': entry.get('fingerprint')}
+    events = list(history.events())
+    atomic_write_json(out_path, {'version': EXPORT_VERSION, 'exported': time.time(),
+                                 'progress': progress, 'events': events})
+    return len(progress), len(events)
+
+
+def grammar_points(bank_path, questions):
+    """{question: grammar point} for the questions, if the bank file is here"""
+    from quiz_bank import grammar_point, load_bank
+    
+    if not os.path.exists(bank_path):
+        return {}
+    try:
+        bank = load_bank(bank_path)
+    except (OSError, ValueError):
+        return {}
+    return {q: grammar_point(bank[q]["question"]) for q in questions if q < len(bank)}
+
+
+def import_progress(in_path, store=None, history=None, bank_dir="."):
+    """Merge an export into the local progress
+
+    Returns {bank key: (answered added, answers added)}, or None for a bank
+    left out because the two sides saved progress for different versions of it.
+    """
+    from quiz_stats import StatsAggregator
+    
+    data = load_json(in_path)
+    if data.get('version') != EXPORT_VERSION:
+        raise ValueError(f"{in_path} is not a progress export")
+    store = store or ProgressStore()
+    history = history or AnswerHistory()
+    
+    changes = {}
+    for file_key, remote in data.get('progress', {}).items():
+        local = store.get(file_key).get('fingerprint')
+        if local and remote.get('fingerprint') and local != remote['fingerprint']:
+            changes[file_key] = None
+    
+    added = {}  # bank key -> answers new to this side
+    for event in history.merge([e for e in data.get('events', []) if e[0] not in changes]):
+        added.setdefault(event[0], []).append(event)
+    
+    for file_key in (set(data.get('progress', {})) | set(added)) - set(changes):
+        remote = data.get('progress', {}).get(file_key, {})
+        before = set(store.get(file_key).get('answered', []))
+        new_answers = added.get(file_key, [])
+        points = grammar_points(os.path.join(bank_dir, file_key), {e[1] for e in new_answers})
+        
+        def update(entry, answered=remote.get('answered', []), total=remote.get('total_questions', 0),
+                   new_answers=new_answers, points=points):
+            entry['answered'] = sorted(set(entry.get('answered', [])).union(answered))
+            if not entry.get('total_questions'):
+                entry['total_questions'] = total
+            if new_answers:
+                stats = StatsAggregator(entry.get('stats'))
+                for _, question, timestamp, _, is_correct, _, _ in new_answers:
+                    stats.update(points.get(question), is_correct, timestamp)
+                entry['stats'] = stats.to_dict()
+        
+        store.change(file_key, update)
+        changes[file_key] = (len(set(remote.get('answered', [])) - before), len(new_answers))
+    store.save()
+    return changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export progress, or merge in progress exported elsewhere")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("file", help="export file to write or to merge in")
+    parser.add_argument("--bank-dir", default=".",
+                        help="where the banks are, to count merged answers per grammar point (default: here)")
+    args = parser.parse_args(argv)
+    
+    if args.action == "export":
+        try:
+            banks, answers = export_progress(args.file)
+        except OSError as e:
+            print(f"Error exporting progress: {e}")
+            return 1
+        print(f"Exported {banks} banks and {answers} answers to {args.file}")
+        return 0
+    
+    try:
+        changes = import_progress(args.file, bank_dir=args.bank_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error importing progress: {e}")
+        return 1
+    for file_key, change in sorted(changes.items()):
+        if change is None:
+            print(f"{file_key}: skipped, this bank file differs from the exported one")
+            continue
+        answered, answers = change
+        print(f"{file_key}: {answered} more answered, {answers} new answers in the history")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Fonts and colours shared by every screen
+
+Widgets are given one of a few named Font objects instead of a font tuple
+of their own. Tk resolves each named font once rather than once per widget,
+and every widget using a font follows it when it is reconfigured, so
+set_base_size() and set_family() restyle the screen on display without
+rebuilding it.
+
+The family is chosen once, at startup: the first installed family in
+FAMILIES that has Japanese glyphs, so Tk is not left to find a fallback for
+the kana and kanji of every label.
+"""
+import tkinter.font as tkfont
+
+# Japanese-capable families, most preferred first (Windows, macOS, Linux)
+FAMILIES = (
+    "Yu Gothic UI", "Meiryo UI", "Meiryo", "MS UI Gothic",
+    "Hiragino Sans", "Hiragino Kaku Gothic ProN",
+    "Noto Sans CJK JP", "Noto Sans JP", "Source Han Sans JP", "IPAexGothic", "IPAPGothic",
+    "TakaoPGothic", "VL PGothic", "Droid Sans Fallback",
+)
+BASE_SIZE = 12
+MIN_SIZE, MAX_SIZE = 8, 24
+
+# name -> (size at BASE_SIZE, weight, slant)
+FONT_SPECS = {
+    'display': (28, "bold", "roman"),
+    'title': (24, "bold", "roman"),
+    'score': (20, "normal", "roman"),
+    'heading': (16, "bold", "roman"),
+    'subheading': (16, "normal", "roman"),
+    'large': (14, "normal", "roman"),
+    'large_bold': (14, "bold", "roman"),
+    'large_italic': (14, "normal", "italic"),
+    'question': (13, "bold", "roman"),
+    'body': (12, "normal", "roman"),
+    'body_bold': (12, "bold", "roman"),
+    'small': (11, "normal", "roman"),
+    'small_bold': (11, "bold", "roman"),
+    'small_italic': (11, "normal", "italic"),
+    'note': (10, "normal", "italic"),
+}
+
+# Colours
+BG = "#f0f0f0"  # Window background
+CARD = "white"  # Question and result cards
+TEXT = "#333"
+MUTED = "#666"
+FAINT = "#999"
+ON_ACCENT = "white"  # Text on coloured buttons and banners
+PRIMARY = "#2196F3"
+SUCCESS = "#4CAF50"
+DANGER = "#f44336"
+ACCENT = "#9C27B0"
+WARNING = "#FF9800"
+REMAINING = "#FF5722"
+LINK = "#1976D2"
+EXPLANATION_BG = "#e3f2fd"
+
+
+def pick_family(root):
+    """The first installed Japanese-capable family, else Tk's default family"""
+    installed = set(tkfont.families(root))
+    for family in FAMILIES:
+        if family in installed:
+            return family
+    return tkfont.nametofont("TkDefaultFont").actual("family")
+
+
+class Theme:
+    """The shared fonts of one window; fonts[name] for each FONT_SPECS name"""
+    
+    def __init__(self, root, family=None, base_size=BASE_SIZE):
+        self.root = root
+        self.family = family or pick_family(root)
+        self.base_size = min(MAX_SIZE, max(MIN_SIZE, base_size))
+        self.fonts = {}
+        for name, (size, weight, slant) in FONT_SPECS.items():
+            self.fonts[name] = tkfont.Font(root, family=self.family, size=self.scaled(size),
+                                           weight=weight, slant=slant)
+    
+    def scaled(self, size):
+        return max(1, round(size * self.base_size / BASE_SIZE))
+    
+    def set_base_size(self, base_size):
+        """Resize every font; widgets using them follow at once"""
+        self.base_size = min(MAX_SIZE, max(MIN_SIZE, base_size))
+        for name, font in self.fonts.items():
+            font.configure(size=self.scaled(FONT_SPECS[name][0]))
+    
+    def set_family(self, family):
+        self.family = family
+        for font in self.fonts.values():
+            font.configure(family=family)
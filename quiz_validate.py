@@ -0,0 +1,147 @@
+"""Question bank validator and linter
+
+    python quiz_validate.py questionbank*.txt [--fast] [--jobs N]
+
+Banks are split into chunks at Q: boundaries and checked in parallel across
+files and chunks. Every problem is reported with its file and line number.
+"""
+import argparse
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+PREFIXES = ("Q:", "A:", "B:", "C:", "Explanation:")
+CHUNK_LINES = 2000
+
+
+class Issue:
+    def __init__(self, line, code, message):
+        self.line = line
+        self.code = code
+        self.message = message
+    
+    def __repr__(self):
+        return f"Issue({self.line}, {self.code!r}, {self.message!r})"
+    
+    def format(self, file_path):
+        return f"{file_path}:{self.line}: {self.code}: {self.message}"
+
+
+def check_record(record, issues):
+    """Load-critical checks on one parsed question (the fast mode)"""
+    line = record.get("line", 0)
+    if record["correct"] is None:
+        issues.append(Issue(line, "missing-answer", "question has no A: (correct answer) line"))
+    if len(record["choices"]) < 2:
+        issues.append(Issue(line, "too-few-choices", f"only {len(record['choices'])} choice(s)"))
+    seen = set()
+    for choice in record["choices"]:
+        if choice in seen:
+            issues.append(Issue(line, "duplicate-choice", f"choice appears twice: {choice}"))
+        seen.add(choice)
+    if not record["explanation"]:
+        issues.append(Issue(line, "empty-explanation", "explanation is missing or empty"))
+
+
+def check_records(records):
+    """Fast mode: check already-parsed questions without re-reading the file"""
+    issues = []
+    for record in records:
+        check_record(record, issues)
+    return issues
+
+
+def check_lines(lines, first_line=1):
+    """Full check of raw bank lines, first_line being the number of lines[0]"""
+    from quiz_bank import parse_question_bank
+    
+    issues = []
+    for offset, raw in enumerate(lines):
+        lineno = first_line + offset
+        line = raw.strip()
+        if not line:
+            continue
+        if not line.startswith(PREFIXES):
+            issues.append(Issue(lineno, "unknown-prefix", f"line is not Q:/A:/B:/C:/Explanation: {line[:30]}"))
+        if not unicodedata.is_normalized("NFC", line):
+            issues.append(Issue(lineno, "not-nfc", "text is not NFC-normalized"))
+    
+    # Choices or explanations before the first Q: are silently dropped by the parser
+    for offset, raw in enumerate(lines):
+        line = raw.strip()
+        if line.startswith("Q:"):
+            break
+        if line.startswith(PREFIXES):
+            issues.append(Issue(first_line + offset, "orphan-line", "line appears before any Q: line"))
+    
+    for record in parse_question_bank(lines, first_line=first_line):
+        check_record(record, issues)
+    return issues
+
+
+def split_chunks(lines, chunk_lines=CHUNK_LINES):
+    """Split lines into (first_line, lines) chunks that start at a Q: line"""
+    chunks = []
+    start = 0
+    for i, raw in enumerate(lines):
+        if i - start >= chunk_lines and raw.lstrip().startswith("Q:"):
+            chunks.append((start + 1, lines[start:i]))
+            start = i
+    chunks.append((start + 1, lines[start:]))
+    return chunks
+
+
+def _check_chunk(args):
+    file_path, first_line, lines, fast = args
+    if fast:
+        from quiz_bank import parse_question_bank
+        issues = check_records(parse_question_bank(lines, first_line=first_line))
+    else:
+        issues = check_lines(lines, first_line)
+    return file_path, issues
+
+
+def validate_files(paths, fast=False, jobs=None, chunk_lines=CHUNK_LINES):
+    """Validate several banks in parallel; returns {path: [Issue, ...]}"""
+    tasks = []
+    results = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        results[path] = []
+        for first_line, chunk in split_chunks(lines, chunk_lines):
+            tasks.append((path, first_line, chunk, fast))
+    
+    if len(tasks) == 1 or jobs == 1:
+        outputs = list(map(_check_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outputs = list(pool.map(_check_chunk, tasks))
+    for path, issues in outputs:
+        results[path].extend(issues)
+    
+    for issues in results.values():
+        issues.sort(key=lambda issue: issue.line)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check question banks for malformed records")
+    parser.add_argument("banks", nargs="+", help="question bank .txt files")
+    parser.add_argument("--fast", action="store_true",
+                        help="only the checks the loader needs (answer, choices, explanation)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    
+    results = validate_files(args.banks, fast=args.fast, jobs=args.jobs)
+    total = 0
+    for path, issues in results.items():
+        for issue in issues:
+            print(issue.format(path))
+        total += len(issues)
+    print(f"{total} issue(s) in {len(results)} file(s)", file=sys.stderr)
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import sys
+import time
+from collections import deque
+from datetime import datetime
+
+
+class EventLoopWatchdog:
+    """Measure Tk event-loop latency with a periodic after() heartbeat
+
+    Every callback wrapped with wrap() is timed. When a heartbeat fires later
+    than threshold_ms past its due time, the stall is recorded in a ring buffer
+    together with the callbacks that ran since the previous heartbeat.
+    """
+    
+    def __init__(self, root, interval_ms=50, threshold_ms=150, capacity=256):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.threshold = threshold_ms / 1000
+        self.stalls = deque(maxlen=capacity)  # Ring buffer, oldest stalls drop off
+        self.ran = []  # (depth, name, seconds) of callbacks since last heartbeat
+        self.stack = []  # Callbacks running right now (nested calls included)
+        self.heartbeats = 0
+        self.worst_lag = 0.0
+        self.expected = None
+        self.after_id = None
+    
+    def start(self):
+        """Schedule the first heartbeat"""
+        self.expected = time.perf_counter() + self.interval_ms / 1000
+        self.after_id = self.root.after(self.interval_ms, self._heartbeat)
+    
+    def stop(self):
+        """Cancel the pending heartbeat"""
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+    
+    def _heartbeat(self):
+        now = time.perf_counter()
+        lag = now - self.expected
+        self.heartbeats += 1
+        self.worst_lag = max(self.worst_lag, lag)
+        
+        if lag > self.threshold:
+            top_level = [r for r in self.ran if r[0] == 0] or self.ran
+            if top_level:
+                culprit = max(top_level, key=lambda r: r[2])[1]
+            else:
+                culprit = "(tk idle/redraw)"
+            self.stalls.append({
+                'time': datetime.now().strftime("%H:%M:%S.%f")[:-3],
+                'lag_ms': round(lag * 1000, 1),
+                'callback': culprit,
+                # A heartbeat can fire inside a modal dialog's nested event loop
+                'active': self.stack[-1] if self.stack else None,
+                'breakdown': [(name, round(secs * 1000, 1)) for depth, name, secs in self.ran],
+            })
+        
+        self.ran = []
+        self.expected = now + self.interval_ms / 1000
+        self.after_id = self.root.after(self.interval_ms, self._heartbeat)
+    
+    def wrap(self, name, func):
+        """Return func instrumented so its run time is attributed to name"""
+        def wrapper(*args, **kwargs):
+            depth = len(self.stack)
+            self.stack.append(name)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stack.pop()
+                self.ran.append((depth, name, time.perf_counter() - start))
+        wrapper.__name__ = getattr(func, '__name__', name)
+        wrapper.__doc__ = getattr(func, '__doc__', None)
+        return wrapper
+    
+    def report(self):
+        """Format the recorded stalls as text, oldest first"""
+        lines = [f"Event-loop watchdog: {len(self.stalls)} stall(s) over "
+                 f"{self.threshold * 1000:.0f} ms in {self.heartbeats} heartbeats, "
+                 f"worst lag {self.worst_lag * 1000:.1f} ms"]
+        for stall in self.stalls:
+            line = f"  [{stall['time']}] {stall['lag_ms']:8.1f} ms  {stall['callback']}"
+            if stall['active']:
+                line += f" (inside {stall['active']})"
+            lines.append(line)
+            for name, ms in stall['breakdown']:
+                lines.append(f"      {name}: {ms} ms")
+        return "\n".join(lines)
+    
+    def dump(self, log_path=None):
+        """Write the report to stderr, or append it to log_path"""
+        text = self.report()
+        if log_path:
+            try:
+                with open(log_path, 'a', encoding='utf-8') as f:
+                    f.write(text + "\n")
+                return
+            except OSError as e:
+                print(f"Error writing diagnostics log: {e}", file=sys.stderr)
+        print(text, file=sys.stderr)